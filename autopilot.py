@@ -0,0 +1,158 @@
+"""Autopilot path planning: dynamic programming over a lane grid ahead of the jet"""
+from bisect import bisect_left
+
+BLOCKED = 1_000_000.0   # Cell cost of a certain hit; still finite so a least-bad path exists
+OBSTACLE_CLEARANCE = 85   # Obstacle hitbox (60) plus room for steering error
+JET_CRASH_RADIUS = 80
+JET_CLEARANCE = 110       # Jet collision radius (80) plus the same
+COIN_REWARD = 40.0
+SHIELD_REWARD = 300.0
+LANE_CHANGE_COST = 3.0
+CENTER_COST = 0.01        # Per unit of |x|: keeps off the walls when nothing else matters
+LATERAL_SPEED = 5.0       # Sideways units per frame we can count on (full lock tops out near 9)
+MAX_LANE_SHIFT = 4
+REAR_WARNING_FRAMES = 30  # How far ahead (in frames of closing speed) a jet behind counts as a threat
+
+
+class LanePlanner:
+    """Plans a lateral path across lanes for the next rows * row_length units of track.
+
+    Obstacles and coins are read from their y-sorted ItemStores, so building
+    the grid only touches the window ahead (two bisects each). Jets are moved
+    to where they will be when we reach each row. A plan is reused until the
+    jet has flown replan_distance, replan_ticks calls have passed (the jets
+    keep moving) or the world version changes (an obstacle destroyed, a jet
+    crashed).
+
+    The grid only covers the rows ahead, so jets behind that could close to
+    crash range soon are not costed; they set rear_threat instead, so the
+    pilot does not hold back into their path.
+    """
+
+    def __init__(self, road_width, lane_width=30, row_length=50, rows=16, replan_distance=100,
+                 replan_ticks=15):
+        half_lanes = int((road_width / 2 - 60) // lane_width)
+        self.lane_x = [k * lane_width for k in range(-half_lanes, half_lanes + 1)]
+        self.lane_width = lane_width
+        self.base_cost = [CENTER_COST * abs(lx) for lx in self.lane_x]
+        self.row_length = row_length
+        self.rows = rows
+        self.replan_distance = replan_distance
+        self.replan_ticks = replan_ticks
+        self.ticks_since_plan = 0
+        self.plan_y = None
+        self.plan_version = None
+        self.path = []       # Planned lane x per row
+        self.blocked = False  # True if every path ahead hits something
+        self.rear_threat = False  # True if a jet behind in our lane is about to reach us
+        self.plans_made = 0
+        # Jets ahead of y + reach can't be level with any row (they don't fly backwards)
+        self.reach = rows * row_length + row_length / 2 + JET_CRASH_RADIUS
+
+    def reset(self):
+        self.plan_y = None
+
+    def snapshot(self):
+        return (self.plan_y, self.plan_version, self.ticks_since_plan, self.path, self.blocked,
+                self.rear_threat)
+
+    def restore(self, snapshot):
+        (self.plan_y, self.plan_version, self.ticks_since_plan, self.path, self.blocked,
+         self.rear_threat) = snapshot
+
+    def lane_of(self, x):
+        lane = round(x / self.lane_width) + len(self.lane_x) // 2
+        return min(max(lane, 0), len(self.lane_x) - 1)
+
+    def target_x(self, x, y, vy, world_version, obstacles, coins, shield, jets, lookahead=2):
+        """Lane x to head for, replanning first if the cached plan is stale.
+        jets is called (only when replanning) for the (x, y, vy) of the other live jets."""
+        self.ticks_since_plan += 1
+        if (self.plan_y is None or world_version != self.plan_version
+                or not 0 <= y - self.plan_y < self.replan_distance or self.ticks_since_plan >= self.replan_ticks):
+            self.plan(x, y, vy, obstacles, coins, shield, jets())
+            self.plan_version = world_version
+            self.ticks_since_plan = 0
+        row = int((y - self.plan_y) // self.row_length) + lookahead
+        return self.path[min(row, len(self.path) - 1)]
+
+    def plan(self, x, y, vy, obstacles, coins, shield, jets):
+        """jets: (x, y, vy) of every other live jet; shield: (x, y) or None"""
+        lane_x, rows, row_length = self.lane_x, self.rows, self.row_length
+        lanes = len(lane_x)
+        row_y = [y + (r + 1) * row_length for r in range(rows)]
+        y_end = row_y[-1] + row_length
+        base_cost = self.base_cost
+        cost = [base_cost[:] for _ in range(rows)]
+
+        def mark(ox, oy, clearance, value, add=False):
+            """Apply value to the cells within clearance of (ox, oy)"""
+            r_lo = max(0, bisect_left(row_y, oy - clearance - row_length / 2))
+            r_hi = min(rows, bisect_left(row_y, oy + clearance + row_length / 2))
+            lo = max(0, self.lane_of(ox - clearance))
+            hi = min(lanes - 1, self.lane_of(ox + clearance))
+            for r in range(r_lo, r_hi):
+                row = cost[r]
+                for lane in range(lo, hi + 1):
+                    if abs(lane_x[lane] - ox) < clearance:
+                        row[lane] = row[lane] + value if add else max(row[lane], value)
+
+        for i in obstacles.indices(y, y_end):
+            mark(obstacles.x[i], obstacles.y[i], OBSTACLE_CLEARANCE, BLOCKED)
+        # Other jets: block each row they will be level with when we get there
+        speed = max(vy, 4.0)
+        rear_threat = False
+        for jx, jy, jvy in jets:
+            if jy < y and abs(jx - x) < JET_CLEARANCE and \
+                    y - jy < JET_CLEARANCE + max(jvy - vy, 0.0) * REAR_WARNING_FRAMES:
+                rear_threat = True
+            lo = max(0, self.lane_of(jx - JET_CLEARANCE))
+            hi = min(lanes - 1, self.lane_of(jx + JET_CLEARANCE))
+            for r, ry in enumerate(row_y):
+                if abs(jy + jvy * (ry - y) / speed - ry) < row_length / 2 + JET_CRASH_RADIUS:
+                    row = cost[r]
+                    for lane in range(lo, hi + 1):
+                        if abs(lane_x[lane] - jx) < JET_CLEARANCE:
+                            row[lane] = BLOCKED
+        for i in coins.indices(y, y_end):
+            mark(coins.x[i], coins.y[i], 45, -COIN_REWARD, add=True)
+        if shield is not None and y <= shield[1] < y_end:
+            mark(shield[0], shield[1], 45, -SHIELD_REWARD, add=True)
+
+        # Cheapest cost to go, back to front. How many lanes we can cross per
+        # row depends on how fast we cover the row. Only the costs are kept
+        # here; the one path we need is walked forwards afterwards.
+        shift = int(LATERAL_SPEED * row_length / speed / self.lane_width)
+        shift = min(max(shift, 1), MAX_LANE_SHIFT)
+        pad = [BLOCKED * rows] * shift
+        to_go = [[0.0] * lanes for _ in range(rows + 1)]
+        for r in range(rows - 1, -1, -1):
+            nxt = to_go[r + 1]
+            best = nxt
+            padded = pad + nxt + pad
+            for d in range(1, shift + 1):
+                step = LANE_CHANGE_COST * d
+                left = padded[shift - d:shift - d + lanes]
+                right = padded[shift + d:shift + d + lanes]
+                best = [b if b <= a + step and b <= c + step else (a if a <= c else c) + step
+                        for b, a, c in zip(best, left, right)]
+            to_go[r] = [c + b for c, b in zip(cost[r], best)]
+
+        # The first row is also only reachable shift lanes from where we are
+        start = self.lane_of(x)
+        lane = min(range(max(0, start - shift), min(lanes, start + shift + 1)), key=to_go[0].__getitem__)
+        self.blocked = to_go[0][lane] >= BLOCKED
+        self.rear_threat = rear_threat
+        path = []
+        for r in range(rows):
+            path.append(lane_x[lane])
+            nxt = to_go[r + 1]
+            best, best_lane = nxt[lane], lane
+            for other in range(max(0, lane - shift), min(lanes, lane + shift + 1)):
+                candidate = nxt[other] + LANE_CHANGE_COST * abs(other - lane)
+                if candidate < best:
+                    best, best_lane = candidate, other
+            lane = best_lane
+        self.path = path
+        self.plan_y = y
+        self.plans_made += 1
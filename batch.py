@@ -0,0 +1,148 @@
+"""Headless races over level x difficulty x seed on a process pool, summarised for difficulty tuning
+
+    python batch.py --seeds 500                          # every level and difficulty, autopilot
+    python batch.py --levels 3 --difficulties 2 3 --seeds 2000 --workers 8 --csv runs.csv
+    python batch.py --replays recordings/*.jrr           # re-run recorded races instead
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import headless
+from replay import InputRecorder, replay
+
+SEEDS_PER_TASK = 25  # Enough races per task to hide the IPC, few enough to keep workers balanced
+CSV_FIELDS = ["level", "difficulty", "seed", "outcome", "race_time", "coins", "distance", "ticks"]
+
+
+def run_seeds(task):
+    """Worker: race one (level, difficulty) over a slice of seeds"""
+    level, difficulty, seeds, autopilot, fleet, endless, max_time = task
+    results = []
+    for seed in seeds:
+        result = headless.run_race(level, difficulty, autopilot, seed, max_time=max_time,
+                                   fleet=fleet, endless=endless)
+        result["seed"] = seed
+        results.append(result)
+    return results
+
+
+def run_replay(path):
+    """Worker: re-run one recorded race"""
+    recording = InputRecorder.load(path)
+    result = replay(recording)
+    result["seed"] = recording.seed
+    return [result]
+
+
+def outcome(result):
+    if result["won"]:
+        return "won"
+    if result["crashed"]:
+        return f"crash:{result['crash_cause']}"
+    if result["timed_out"]:
+        return "timeout"
+    return "lost"  # Finished behind an AI jet
+
+
+def seed_tasks(levels, difficulties, seeds, seed_base, autopilot, fleet, endless, max_time):
+    tasks = []
+    for start in range(seed_base, seed_base + seeds, SEEDS_PER_TASK):
+        chunk = range(start, min(start + SEEDS_PER_TASK, seed_base + seeds))
+        for level in levels:
+            for difficulty in difficulties:
+                tasks.append((level, difficulty, list(chunk), autopilot, fleet, endless, max_time))
+    return tasks
+
+
+def summarize(results):
+    """{(level, difficulty): stats} over every race"""
+    groups = {}
+    for result in results:
+        groups.setdefault((result["level"], result["difficulty"]), []).append(result)
+    summary = {}
+    for key, group in sorted(groups.items()):
+        n = len(group)
+        outcomes = [outcome(r) for r in group]
+        times = sorted(r["race_time"] for r in group if r["finished"])
+        summary[key] = {
+            "races": n,
+            "won": outcomes.count("won") / n,
+            "lost": outcomes.count("lost") / n,
+            "crash_obstacle": outcomes.count("crash:obstacle") / n,
+            "crash_jet": outcomes.count("crash:jet") / n,
+            "timeout": outcomes.count("timeout") / n,
+            "finish_p50": times[len(times) // 2] if times else None,
+            "finish_best": times[0] if times else None,
+            "coins": sum(r["coins"] for r in group) / n,
+        }
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'lvl':>3} {'diff':>4} {'races':>6} {'win':>6} {'lost':>6} {'obst':>6} {'jet':>6} {'t/o':>6}"
+          f" {'finish p50':>10} {'best':>7} {'coins':>6}")
+    for (level, difficulty), s in summary.items():
+        p50 = f"{s['finish_p50']:.2f}s" if s["finish_p50"] is not None else "-"
+        best = f"{s['finish_best']:.2f}s" if s["finish_best"] is not None else "-"
+        print(f"{level:>3} {difficulty:>4} {s['races']:>6} {s['won']:>6.1%} {s['lost']:>6.1%}"
+              f" {s['crash_obstacle']:>6.1%} {s['crash_jet']:>6.1%} {s['timeout']:>6.1%}"
+              f" {p50:>10} {best:>7} {s['coins']:>6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many headless races in parallel and summarise them")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--difficulties", type=int, nargs="+", choices=[1, 2, 3], default=[1, 2, 3])
+    parser.add_argument("--seeds", type=int, default=100, help="races per level and difficulty")
+    parser.add_argument("--seed-base", type=int, default=0)
+    parser.add_argument("--pilot", choices=["auto", "throttle"], default="auto")
+    parser.add_argument("--fleet", type=int, default=0)
+    parser.add_argument("--endless", action="store_true")
+    parser.add_argument("--max-time", type=float, default=headless.MAX_RACE_SECONDS)
+    parser.add_argument("--replays", nargs="+", metavar="FILE", help="recorded races to re-run instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--csv", metavar="PATH", help="also write one row per race")
+    args = parser.parse_args()
+
+    if args.replays:
+        worker, tasks = run_replay, args.replays
+        total = len(tasks)
+    else:
+        worker = run_seeds
+        tasks = seed_tasks(args.levels, args.difficulties, args.seeds, args.seed_base,
+                           args.pilot == "auto", args.fleet, args.endless, args.max_time)
+        total = sum(len(task[2]) for task in tasks)
+
+    csv_file = open(args.csv, "w", newline="") if args.csv else None
+    writer = csv.DictWriter(csv_file, CSV_FIELDS, extrasaction="ignore") if csv_file else None
+    if writer:
+        writer.writeheader()
+
+    results = []
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        # Results stream back task by task, in whatever order the workers finish
+        for batch in pool.imap_unordered(worker, tasks):
+            results.extend(batch)
+            if writer:
+                for result in batch:
+                    writer.writerow(dict(result, outcome=outcome(result)))
+            elapsed = time.perf_counter() - start
+            print(f"\r{len(results)}/{total} races, {len(results) / elapsed:.0f} races/s",
+                  end="", file=sys.stderr, flush=True)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    if csv_file:
+        csv_file.close()
+
+    print_summary(summarize(results))
+    print(f"{len(results)} races in {elapsed:.2f}s on {args.workers} worker(s) "
+          f"({len(results) / elapsed:.0f} races/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Deterministic benchmarks for the simulation hot paths (no OpenGL needed)
+
+    python bench.py                          # all cases, all sizes
+    python bench.py --save-baseline bench_baseline.json
+    python bench.py --baseline bench_baseline.json   # exit 1 on regressions
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+
+import test as game
+import headless
+from fleet import JetFleet
+from level_cache import LevelCache
+from world import ItemStore
+
+SEED = 423
+STRESS_SIZES = {
+    # name: (obstacles, coins, fleet jets, road length)
+    "small": (16, 20, 0, 9000),
+    "10k": (10_000, 10_000, 100, 1_000_000),
+    "100k": (100_000, 100_000, 1000, 10_000_000),
+}
+REGRESSION_TOLERANCE = 0.25  # Fail if p50 gets more than 25% slower
+
+
+def timed_calls(setup, call, iterations):
+    """Per-call latencies in seconds (setup is run untimed before every call)"""
+    samples = []
+    clock = time.perf_counter
+    for _ in range(iterations):
+        setup()
+        start = clock()
+        call()
+        samples.append(clock() - start)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+    pick = lambda p: ordered[min(n - 1, n * p // 100)] * 1e6
+    total = sum(ordered)
+    return {
+        "calls": n,
+        "p50_us": pick(50), "p90_us": pick(90), "p99_us": pick(99), "max_us": ordered[-1] * 1e6,
+        "calls_per_sec": n / total if total else float("inf"),
+    }
+
+
+def stress_level(obstacle_count, coin_count, fleet_count, road_length):
+    """Race in progress on a long road with the given object counts (fixed seed)"""
+    headless.start_race(level=3, difficulty=2, autopilot=True, seed=SEED, fleet=fleet_count)
+    rng = random.Random(SEED)
+    game.ROAD_LENGTH = road_length
+    game.FINISH_LINE_POSITION = road_length - 200
+    half = game.ROAD_WIDTH / 3
+    game.obstacles = ItemStore([rng.uniform(-half, half) for _ in range(obstacle_count)],
+                               [rng.uniform(400, road_length - 400) for _ in range(obstacle_count)],
+                               [30] * obstacle_count, [rng.choice([0, 1]) for _ in range(obstacle_count)])
+    game.coin_positions = ItemStore([rng.uniform(-half, half) for _ in range(coin_count)],
+                                    [rng.uniform(200, road_length - 500) for _ in range(coin_count)],
+                                    [30] * coin_count, [0] * coin_count)
+    return rng
+
+
+def place_player(rng):
+    """Put the player somewhere mid-track, alive and moving"""
+    player = game.player_jet
+    player.crashed = False
+    player.finished = False
+    player.has_shield = True  # Hits consume the shield instead of ending the race
+    player.x = rng.uniform(-300, 300)
+    player.y = rng.uniform(1000, game.ROAD_LENGTH - 1000)
+    player.velocity_y = 10
+    game.game_state = game.RACING
+
+
+def bench_generate(level):
+    def setup():
+        game.seed_race(SEED)
+        game.current_level = level
+        game.ROAD_LENGTH = 3000 + level * 2000
+    return setup, game.generate_level_objects
+
+
+def build_cases(size, cache_dir):
+    obstacle_count, coin_count, fleet_count, road_length = STRESS_SIZES[size]
+    dt = game.SIM_DT
+    rng = stress_level(obstacle_count, coin_count, fleet_count, road_length)
+
+    def fresh_player():
+        place_player(rng)
+
+    def heavy_fire(rounds, in_flight=False):
+        def setup():
+            place_player(rng)
+            game.bullets.clear()
+            for _ in range(rounds):
+                game.player_jet.rotation = rng.uniform(-25, 25)
+                game.fire_bullet()
+                game.bullets.y[len(game.bullets) - 1] += rng.uniform(0, 2000)
+            if in_flight:
+                game.update_bullets(dt) # Paths already swept: time a step of rounds in the air
+        return setup
+
+    def ai_field():
+        place_player(rng)
+        game.bullets.clear()
+        for jet in game.ai_jets:
+            jet.crashed = jet.finished = False
+        if fleet_count:
+            game.fleet = JetFleet(fleet_count, game.ROAD_WIDTH)
+
+    snapshot = [] # For restore_world, taken in its setup
+
+    cache = LevelCache(cache_dir)
+    cache.store(3, SEED, road_length, game.coin_positions, game.obstacles, game.shield_token)
+
+    return [
+        ("level_cache load", lambda: None, lambda: cache.load(3, SEED, road_length), 2000),
+        ("check_collisions", fresh_player, game.player_jet.check_collisions, 2000),
+        ("update_bullets x200 fired", heavy_fire(200), lambda: game.update_bullets(dt), 300),
+        ("update_bullets x2000 in flight", heavy_fire(2000, True), lambda: game.update_bullets(dt), 30),
+        ("run_auto_pilot", fresh_player, lambda: game.run_auto_pilot(dt), 2000),
+        (f"update_ai_racers +{fleet_count}", ai_field, lambda: game.update_ai_racers(dt), 200),
+        ("update_highway_game", ai_field, lambda: game.update_highway_game(dt), 200),
+        ("capture_world", ai_field, game.capture_world, 200),
+        ("restore_world", lambda: snapshot.append(game.capture_world()), lambda: game.restore_world(snapshot.pop()), 200),
+    ]
+
+
+def run(sizes, quick=False):
+    results = {}
+    scale = 10 if quick else 1
+    for level in (1, 2, 3):
+        setup, call = bench_generate(level)
+        results[f"generate_level_objects L{level}"] = summarize(timed_calls(setup, call, 200 // scale))
+    with tempfile.TemporaryDirectory(prefix="jet-racer-bench-") as cache_dir:
+        for size in sizes:
+            for name, setup, call, iterations in build_cases(size, cache_dir):
+                results[f"{name} [{size}]"] = summarize(timed_calls(setup, call, max(10, iterations // scale)))
+    return results
+
+
+def print_table(results, baseline=None):
+    print(f"{'case':<40} {'calls/s':>10} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} {'max us':>9}")
+    regressions = []
+    for name, r in results.items():
+        line = (f"{name:<40} {r['calls_per_sec']:>10.0f} {r['p50_us']:>9.1f} {r['p90_us']:>9.1f} "
+                f"{r['p99_us']:>9.1f} {r['max_us']:>9.1f}")
+        if baseline and name in baseline:
+            change = r["p50_us"] / baseline[name]["p50_us"] - 1 if baseline[name]["p50_us"] else 0.0
+            line += f"  {change:+.0%}"
+            if change > REGRESSION_TOLERANCE:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Jet Racer simulation")
+    parser.add_argument("--sizes", nargs="+", choices=list(STRESS_SIZES), default=list(STRESS_SIZES))
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (smoke run)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store these results as the baseline")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.quick)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = print_table(results, baseline)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {REGRESSION_TOLERANCE:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Bullets in a fixed-capacity pool, swept against obstacles ahead of time"""
+import ctypes
+import heapq
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from operator import add, mul
+
+CAPACITY = 4096    # Rounds in flight; firing past this reuses slots round-robin
+HIT_RADIUS = 35    # Bullet vs obstacle center
+MAX_FLIGHT = 30.0  # Seconds between re-checks of a bullet that is hitting nothing
+
+
+def first_hit(store, x0, y0, dx, dy, radius):
+    """(index, t) of the first live item in a y-sorted ItemStore that the segment
+    (x0, y0) + t * (dx, dy), 0 <= t <= 1, comes within radius of; (-1, 1.0) if none"""
+    xs, ys, alive = store.x, store.y, store.alive
+    r_sq = radius * radius
+    a = dx * dx + dy * dy
+    hit, first = -1, 1.0
+    if dy > 0:
+        j, end = bisect_left(ys, y0 - radius), len(ys)
+    else:
+        j, end = bisect_left(ys, y0 + dy - radius), bisect_right(ys, y0 + radius)
+    while j < end:
+        oy = ys[j]
+        if dy > 0 and oy - radius > y0 + first * dy:
+            break  # Sorted by y: nothing further along is reached sooner
+        if alive[j]:
+            fx, fy = x0 - xs[j], y0 - oy
+            c = fx * fx + fy * fy - r_sq
+            if c < 0:
+                return j, 0.0  # Starts inside it
+            b = fx * dx + fy * dy
+            if b < 0 and a:
+                disc = b * b - a * c
+                if disc >= 0:
+                    t = (-b - math.sqrt(disc)) / a
+                    if t <= first:
+                        hit, first = j, t
+        j += 1
+    return hit, first
+
+
+class BulletPool:
+    """Live bullets are slots [0, count) of preallocated parallel arrays.
+
+    Bullets fly straight at constant speed, so a bullet is stored as its
+    line: it is at (x + vx * t, y + vy * t) at time t of the pool's clock.
+    Nothing is integrated per step. When a bullet is fired (and again when
+    its prediction runs out) the rest of its path is swept against the
+    obstacles and an event is queued for the step in which it first touches
+    one, or leaves the area. Only bullets with an event due are looked at;
+    that step's segment is swept again and whatever it touches first is
+    hit. If the obstacle has gone in the meantime the path is swept again
+    from there. No step can skip over an obstacle, and thousands of rounds
+    in flight cost next to nothing until they arrive.
+
+    A bullet that is done is swap-removed (the last live one moves into its
+    slot), so the live range stays packed: place(t) writes every position
+    into self.vertices in one pass, float32 xyz for a single
+    glDrawArrays(GL_POINTS).
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.x = array('d', [0.0]) * capacity
+        self.y = array('d', [0.0]) * capacity
+        self.vx = array('d', [0.0]) * capacity
+        self.vy = array('d', [0.0]) * capacity
+        self.xyz = array('f', bytes(12 * capacity))
+        # Shares the array's memory; PyOpenGL takes ctypes arrays as they are
+        self.vertices = (ctypes.c_float * len(self.xyz)).from_buffer(self.xyz)
+        self.serial = array('q', [0]) * capacity
+        self.due = array('d', [0.0]) * capacity
+        self.slot_of = {}   # serial -> slot, for the events
+        self.events = []    # heap of (due time, serial); stale entries are skipped
+        self.time = 0.0
+        self.next_serial = 0
+        self.count = 0
+        self.next_recycle = 0
+        self.recycled = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.time = 0.0
+        self.slot_of.clear()
+        self.events = []
+
+    def fire(self, x, y, z, vx, vy):
+        """Add a bullet; with the pool full it replaces one in flight. Returns its slot."""
+        if self.count < self.capacity:
+            i = self.count
+            self.count += 1
+        else:
+            i = self.next_recycle
+            self.next_recycle = (i + 1) % self.capacity
+            self.recycled += 1
+            del self.slot_of[self.serial[i]]
+        now = self.time
+        self.x[i], self.y[i], self.vx[i], self.vy[i] = x - vx * now, y - vy * now, vx, vy
+        self.xyz[3 * i], self.xyz[3 * i + 1], self.xyz[3 * i + 2] = x, y, z
+        serial = self.next_serial
+        self.next_serial += 1
+        self.serial[i] = serial
+        self.slot_of[serial] = i
+        # Checked on its first step (its path gets swept then)
+        self.due[i] = now
+        heapq.heappush(self.events, (now, serial))
+        return i
+
+    def retire(self, i):
+        last = self.count - 1
+        del self.slot_of[self.serial[i]]
+        if i != last:
+            self.x[i], self.y[i], self.vx[i], self.vy[i] = self.x[last], self.y[last], self.vx[last], self.vy[last]
+            self.xyz[3 * i:3 * i + 3] = self.xyz[3 * last:3 * last + 3]
+            self.serial[i], self.due[i] = self.serial[last], self.due[last]
+            self.slot_of[self.serial[i]] = i
+        self.count = last
+        if self.next_recycle >= last:
+            self.next_recycle = 0
+
+    def snapshot(self):
+        n = self.count
+        return (self.time, self.next_serial, self.x[:n], self.y[:n], self.vx[:n], self.vy[:n],
+                self.xyz[:3 * n], self.serial[:n], self.due[:n], self.events[:])
+
+    def restore(self, snapshot):
+        (self.time, self.next_serial, xs, ys, vxs, vys, xyz, serials, due, events) = snapshot
+        n = self.count = len(xs)
+        if n:  # An empty slice assignment counts as a resize while the buffer is exported
+            self.x[:n], self.y[:n], self.vx[:n], self.vy[:n] = xs, ys, vxs, vys
+            self.xyz[:3 * n], self.serial[:n], self.due[:n] = xyz, serials, due
+        self.events = events[:]
+        self.slot_of = {serial: i for i, serial in enumerate(serials)}
+        self.next_recycle = 0
+
+    def update(self, dt, obstacles, y_max, x_max=math.inf, radius=HIT_RADIUS):
+        """Advance the clock by dt. A bullet that touched an obstacle this step
+        kills it and is retired, as is one outside 0 < y < y_max, |x| < x_max.
+        Returns the indices of the obstacles killed (valid until compact())."""
+        self.time = now = self.time + dt
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        events, slot_of, due = self.events, self.slot_of, self.due
+        hits = []
+        rescheduled = []
+        while events and events[0][0] <= now:
+            when, serial = heapq.heappop(events)
+            i = slot_of.get(serial)
+            if i is None or due[i] != when:
+                continue  # Retired, recycled or rescheduled since
+            vx, vy = vxs[i], vys[i]
+            x1, y1 = xs[i] + vx * now, ys[i] + vy * now
+            dx, dy = vx * dt, vy * dt
+            hit, _ = first_hit(obstacles, x1 - dx, y1 - dy, dx, dy, radius)
+            if hit >= 0:
+                obstacles.kill(hit)
+                hits.append(hit)
+                self.retire(i)
+                continue
+            if not (0 < y1 < y_max and -x_max < x1 < x_max):
+                self.retire(i)
+                continue
+            # Sweep the rest of the path, up to where it leaves the area
+            flight = MAX_FLIGHT
+            if vy:
+                flight = min(flight, ((y_max if vy > 0 else 0) - y1) / vy)
+            if vx:
+                flight = min(flight, ((x_max if vx > 0 else -x_max) - x1) / vx)
+            hit, t = first_hit(obstacles, x1, y1, vx * flight, vy * flight, radius)
+            due[i] = now + t * flight
+            rescheduled.append((due[i], serial))
+        for event in rescheduled:
+            heapq.heappush(events, event)
+        return hits
+
+    def place(self, t=None):
+        """Write every live bullet's position at time t (default: now) into self.vertices"""
+        n = self.count
+        if n:
+            t = self.time if t is None else t
+            self.xyz[0:3 * n:3] = array('f', map(add, self.x[:n], map(mul, self.vx[:n], repeat(t))))
+            self.xyz[1:3 * n:3] = array('f', map(add, self.y[:n], map(mul, self.vy[:n], repeat(t))))
+        return n
@@ -0,0 +1,63 @@
+"""View culling against the chase / cockpit camera (sphere vs view frustum test)"""
+import math
+
+
+class ViewCuller:
+    """View frustum of the current camera plus drawn/culled counters"""
+
+    def __init__(self, view_distance, aspect):
+        self.view_distance = view_distance  # Same as the gluPerspective far plane
+        self.aspect = aspect
+        self.eye_x = self.eye_y = self.eye_z = 0.0
+        self.forward = (0.0, 1.0, 0.0)
+        self.right = (1.0, 0.0, 0.0)
+        self.up = (0.0, 0.0, 1.0)
+        self.tan_half_h = self.tan_half_v = 1.0
+        self.cos_half_h = self.cos_half_v = math.sqrt(0.5)
+        self.drawn = 0
+        self.culled = 0
+
+    def set_camera(self, eye_x, eye_y, eye_z, look_x, look_y, look_z, fov_y):
+        """Take the camera from the gluLookAt (up is +z) / gluPerspective arguments"""
+        fx, fy, fz = look_x - eye_x, look_y - eye_y, look_z - eye_z
+        length = math.sqrt(fx * fx + fy * fy + fz * fz) or 1.0
+        fx, fy, fz = fx / length, fy / length, fz / length
+        # Right = forward x up(0, 0, 1), then the camera's own up = right x forward
+        rx, ry = fy, -fx
+        length = math.hypot(rx, ry)
+        rx, ry = (rx / length, ry / length) if length else (1.0, 0.0)  # Looking straight down
+        self.eye_x, self.eye_y, self.eye_z = eye_x, eye_y, eye_z
+        self.forward = (fx, fy, fz)
+        self.right = (rx, ry, 0.0)
+        self.up = (ry * fz, -rx * fz, rx * fy - ry * fx)
+        half_v = math.radians(fov_y) / 2
+        half_h = math.atan(math.tan(half_v) * self.aspect)
+        self.tan_half_v, self.cos_half_v = math.tan(half_v), math.cos(half_v)
+        self.tan_half_h, self.cos_half_h = math.tan(half_h), math.cos(half_h)
+
+    def begin_frame(self):
+        self.drawn = 0
+        self.culled = 0
+
+    def y_range(self, margin=100):
+        """Track y-window that can contain anything visible"""
+        return self.eye_y - margin, self.eye_y + self.view_distance + margin
+
+    def visible(self, x, y, z, radius=50):
+        """True if a bounding sphere at (x, y, z) may be on screen (counts the result).
+        Each side plane is tested at the sphere's distance from it, so objects
+        in the corners of the view stay drawn however the camera is pitched."""
+        dx, dy, dz = x - self.eye_x, y - self.eye_y, z - self.eye_z
+        fx, fy, fz = self.forward
+        depth = dx * fx + dy * fy + dz * fz
+        if -radius <= depth <= self.view_distance + radius:
+            rx, ry, _ = self.right
+            ux, uy, uz = self.up
+            across = abs(dx * rx + dy * ry)
+            upward = abs(dx * ux + dy * uy + dz * uz)
+            if (across <= depth * self.tan_half_h + radius / self.cos_half_h
+                    and upward <= depth * self.tan_half_v + radius / self.cos_half_v):
+                self.drawn += 1
+                return True
+        self.culled += 1
+        return False
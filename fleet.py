@@ -0,0 +1,205 @@
+"""Large AI fleets: jet state held in arrays and updated in one batch per tick"""
+import math
+from array import array
+
+FLEET_COLORS = [
+    (0.8, 0.2, 0.2), (0.2, 0.8, 0.2), (0.8, 0.8, 0.2),
+    (0.9, 0.5, 0.1), (0.6, 0.2, 0.9), (0.2, 0.6, 0.9),
+]
+LANE_SPACING = 90   # Starting grid spacing; wider than the 80 unit crash radius
+ROW_SPACING = 100
+START_CLEARANCE = 80  # Grid lanes this close to the player's start (x = 0) are left empty
+# AI level of detail: jets within NEAR_RANGE of the player (in y) decide every
+# tick; the rest decide every FAR_INTERVAL ticks and coast in between
+NEAR_RANGE = 800
+FAR_INTERVAL = 6
+# Per-jet arrays that change during a race (what a snapshot has to copy)
+STATE_ARRAYS = ('x', 'y', 'z', 'prev_x', 'prev_y', 'vx', 'vy', 'speed', 'rotation', 'bank_angle',
+                'race_time', 'crashed', 'finished')
+
+
+def decay_gain(rate, ticks):
+    """Velocity gained over ticks of v = (v + push) * rate, per unit of push"""
+    if rate == 1:
+        return float(ticks)
+    return rate * (1 - rate ** ticks) / (1 - rate)
+
+
+def far_rates(step, air_resistance):
+    """(stabilize, drag, thrust gain, push gain, bank follow) for FAR_INTERVAL
+    ticks taken at once. Thrust gain times acceleration power and the speed
+    multiplier is the batch's thrust; push gain times a per-tick push is its
+    steering."""
+    stabilize, drag = 0.92 ** step, air_resistance ** step
+    return (stabilize ** FAR_INTERVAL, drag ** FAR_INTERVAL, step * decay_gain(drag, FAR_INTERVAL),
+            step * decay_gain(stabilize, FAR_INTERVAL), 1 - 0.9 ** (step * FAR_INTERVAL))
+
+
+def far_velocity_y(vy, vx, speed, max_speed, drag, thrust):
+    """vy after a batch of far ticks. Per tick, thrust stops once the jet is at
+    max_speed; the batch's summed thrust is cut off there too, rather than
+    carrying the jet past it."""
+    if speed >= max_speed:
+        return vy * drag
+    cap = math.sqrt(max(max_speed * max_speed - vx * vx, 0.0))
+    return min(vy * drag + thrust, max(cap, vy * drag))
+
+
+class FleetJetView:
+    """Read-only Jet look-alike for one fleet slot (what draw_fighter_jet needs)"""
+    __slots__ = ('x', 'y', 'z', 'prev_x', 'prev_y', 'rotation', 'bank_angle', 'speed', 'crashed', 'color')
+    has_shield = False
+    is_player = False
+
+    def render_position(self, alpha):
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha,
+                self.z)
+
+
+class JetFleet:
+    """AI jets as parallel arrays, same physics and steering as update_ai_racers"""
+
+    def __init__(self, count, road_width, max_speed=9.5, acceleration_power=0.4):
+        self.road_width = road_width
+        self.max_speed = max_speed
+        self.acceleration_power = acceleration_power
+        # Lanes inside the AI's comfort zone (|x| < road_width / 3) so they don't swerve at the start
+        lanes = int((road_width * 2 / 3) // LANE_SPACING) + 1
+        left = -(lanes - 1) * LANE_SPACING / 2
+        # Grid up behind the player's start line so nobody spawns on top of anyone. The
+        # player's lane stays empty: the grid launches at full thrust, the player may not.
+        lane_x = [left + k * LANE_SPACING for k in range(lanes)]
+        lane_x = [lx for lx in lane_x if abs(lx) >= START_CLEARANCE]
+        lanes = len(lane_x)
+        self.x = array('d', (lane_x[i % lanes] for i in range(count)))
+        self.y = array('d', (-ROW_SPACING * (1 + i // lanes) for i in range(count)))
+        self.z = array('d', [30.0]) * count
+        self.prev_x = array('d', self.x)
+        self.prev_y = array('d', self.y)
+        self.vx = array('d', [0.0]) * count
+        self.vy = array('d', [0.0]) * count
+        self.speed = array('d', [0.0]) * count
+        self.rotation = array('d', [0.0]) * count
+        self.bank_angle = array('d', [0.0]) * count
+        self.race_time = array('d', [0.0]) * count
+        self.crashed = bytearray(count)
+        self.finished = bytearray(count)
+        self.colors = [FLEET_COLORS[i % len(FLEET_COLORS)] for i in range(count)]
+        self.ticks = 0  # Picks which far jets decide this tick
+
+    def __len__(self):
+        return len(self.x)
+
+    def live_indices(self):
+        crashed = self.crashed
+        return [i for i in range(len(self.x)) if not crashed[i]]
+
+    def update(self, dt, now, player_x, player_y, speed_multiplier,
+               air_resistance, finish_y, race_start_time):
+        """Steer and integrate every jet for one tick. Jets far from the player
+        only steer every FAR_INTERVAL ticks and coast on their velocity between."""
+        x, y, z, vx, vy = self.x, self.y, self.z, self.vx, self.vy
+        prev_x, prev_y = self.prev_x, self.prev_y
+        speed, rotation, bank = self.speed, self.rotation, self.bank_angle
+        crashed, finished = self.crashed, self.finished
+        max_speed = self.max_speed
+        step = dt * 60  # Per-frame tuning constants are for 60 FPS
+        thrust = self.acceleration_power * speed_multiplier * step
+        steer_zone = self.road_width / 3
+        wall = self.road_width / 2 - 50
+        stabilize = 0.92 ** step
+        drag = air_resistance ** step
+        bank_follow = 1 - 0.9 ** step
+        tick_phase = int(now * 2)
+        near_lo, near_hi = player_y - NEAR_RANGE, player_y + NEAR_RANGE
+        # Far jets: FAR_INTERVAL ticks of thrust, steering and decay in one go
+        far_stabilize, far_drag, far_gain, far_push, far_bank_follow = far_rates(step, air_resistance)
+        far_thrust = self.acceleration_power * speed_multiplier * far_gain
+        far_phase = self.ticks % FAR_INTERVAL
+        self.ticks += 1
+
+        for i in range(len(x)):
+            prev_x[i], prev_y[i] = x[i], y[i]
+            if crashed[i]:
+                if z[i] > 0:
+                    z[i] -= 2 * step
+                    rotation[i] += 10 * step
+                continue
+            if finished[i]:
+                continue
+
+            jx = x[i]
+            if near_lo < y[i] < near_hi:
+                # Steering (see update_ai_racers)
+                if speed[i] < max_speed:
+                    vy[i] += thrust
+                if abs(y[i] - player_y) < 200:
+                    if abs(jx - player_x) < 120:
+                        vx[i] += (0.3 if jx > player_x else -0.3) * step
+                elif (tick_phase + i) % 20 == 0:
+                    if abs(jx) < steer_zone:
+                        vx[i] += (0.05 if jx < 0 else -0.05) * step
+                if abs(jx) > steer_zone:
+                    vx[i] -= jx * 0.05 * step
+
+                # Physics (see Jet.update)
+                vx[i] *= stabilize
+                vy[i] *= drag
+                bank[i] += (-vx[i] * 15 - bank[i]) * bank_follow
+                decided = True
+            elif i % FAR_INTERVAL == far_phase:
+                # Same steering, FAR_INTERVAL ticks at a time (the player is never within 200 here)
+                push = 0.0
+                if (tick_phase + i) % 20 == 0 and abs(jx) < steer_zone:
+                    push = 0.05 if jx < 0 else -0.05
+                if abs(jx) > steer_zone:
+                    push -= jx * 0.05
+                vx[i] = vx[i] * far_stabilize + push * far_push
+                vy[i] = far_velocity_y(vy[i], vx[i], speed[i], max_speed, far_drag, far_thrust)
+                bank[i] += (-vx[i] * 15 - bank[i]) * far_bank_follow
+                decided = True
+            else:
+                decided = False
+
+            jx += vx[i] * step
+            y[i] += vy[i] * step
+            if decided:
+                z[i] = 30 + math.sin(now * 5 + jx) * 2
+                speed[i] = math.sqrt(vx[i] * vx[i] + vy[i] * vy[i])
+            if abs(jx) > wall:
+                vx[i] *= -0.5
+                speed[i] *= 0.8
+                jx = wall if jx > 0 else -wall
+            x[i] = jx
+
+            if y[i] >= finish_y:
+                finished[i] = 1
+                self.race_time[i] = now - race_start_time
+
+    def snapshot(self):
+        return self.ticks, [getattr(self, name)[:] for name in STATE_ARRAYS]
+
+    def restore(self, snapshot):
+        self.ticks, columns = snapshot
+        for name, column in zip(STATE_ARRAYS, columns):
+            getattr(self, name)[:] = column
+
+    def best_finish_time(self):
+        """Fastest race time of a finished, intact jet (None if nobody finished)"""
+        times = [self.race_time[i] for i in range(len(self.x)) if self.finished[i] and not self.crashed[i]]
+        return min(times) if times else None
+
+    def count_ahead(self, y):
+        ys, crashed = self.y, self.crashed
+        return sum(1 for i in range(len(ys)) if ys[i] > y and not crashed[i])
+
+    def view(self, i, out=None):
+        """Fill (or create) a FleetJetView for slot i"""
+        v = out or FleetJetView()
+        v.x, v.y, v.z = self.x[i], self.y[i], self.z[i]
+        v.prev_x, v.prev_y = self.prev_x[i], self.prev_y[i]
+        v.rotation, v.bank_angle, v.speed = self.rotation[i], self.bank_angle[i], self.speed[i]
+        v.crashed = bool(self.crashed[i])
+        v.color = self.colors[i]
+        return v
@@ -0,0 +1,45 @@
+"""Frame times of the PyOpenGL modes on the same scripted race (needs a display)
+
+    python gl_compare.py                     # fast / standard / debug, 600 frames each
+    python gl_compare.py --frames 1200 --fleet 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+GAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test.py")
+MODES = ("fast", "standard", "debug")
+
+
+def measure(mode, frames, seed, extra=()):
+    """Run the game in its own process (the GL flags are fixed at import) and parse its JSON line"""
+    command = [sys.executable, GAME, "--gl-mode", mode, "--bench-frames", str(frames),
+               "--seed", str(seed), *extra]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare frame times of the PyOpenGL checking modes")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=423)
+    parser.add_argument("--fleet", type=int, default=0)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    extra = ["--fleet", str(args.fleet)] if args.fleet else []
+    results = {mode: measure(mode, args.frames, args.seed, extra) for mode in args.modes}
+    phases = list(next(iter(results.values()))["phases_ms"])
+    print(f"{'mode':<10} {'fps':>7} {'frame p50':>10} {'frame p99':>10}" + "".join(f" {p + ' p50':>11}" for p in phases))
+    for mode, r in results.items():
+        print(f"{mode:<10} {r['fps']:>7.1f} {r['frame_ms'][0]:>10.2f} {r['frame_ms'][1]:>10.2f}"
+              + "".join(f" {r['phases_ms'][p][0]:>11.3f}" for p in phases))
+    if "fast" in results and "debug" in results:
+        speedup = results["debug"]["frame_ms"][0] / results["fast"]["frame_ms"][0]
+        print(f"fast vs debug: {speedup:.2f}x median frame time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Import PyOpenGL for rendering: the installed package, else the bundled OpenGL.zip via zipimport
+
+zipimport ignores the __pycache__ folders inside OpenGL.zip, so importing the
+bundle as shipped compiles every PyOpenGL module from source on each start.
+The first start writes a sourceless copy with the .pyc files where zipimport
+looks for them (__pycache__/OpenGL.<tag>.zip) and later starts import that.
+"""
+import importlib
+import importlib.util
+import marshal
+import os
+import sys
+import time
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUNDLE = os.path.join(HERE, "OpenGL.zip")
+
+# OpenGL package flags per --gl-mode. They are read when OpenGL.GL is first
+# imported, so they have to be set on the bare package before that.
+GL_MODES = {
+    # No glGetError after every call, no logging, no array size checks
+    "fast": {"ERROR_CHECKING": False, "ERROR_LOGGING": False, "CONTEXT_CHECKING": False,
+             "ARRAY_SIZE_CHECKING": False},
+    "standard": {},  # PyOpenGL defaults
+    # Log every GL error and fail calls made without a current context
+    "debug": {"ERROR_CHECKING": True, "ERROR_LOGGING": True, "CONTEXT_CHECKING": True,
+              "ARRAY_SIZE_CHECKING": True},
+}
+
+
+def compiled_bundle_path():
+    optimize = f".opt-{sys.flags.optimize}" if sys.flags.optimize else ""
+    return os.path.join(HERE, "__pycache__", f"OpenGL.{sys.implementation.cache_tag}{optimize}.zip")
+
+
+def build_compiled_bundle(source=BUNDLE, target=None):
+    """Write a copy of the bundle with every .py replaced by its .pyc (replaces target atomically)"""
+    target = target or compiled_bundle_path()
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp = f"{target}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(temp, "w") as dst:
+        for info in src.infolist():
+            name = info.filename
+            if name.endswith("/") or "/__pycache__/" in name:
+                continue
+            data = src.read(info)
+            if name.endswith(".py"):
+                code = compile(data, os.path.join(target, name), "exec", dont_inherit=True)
+                # Sourceless pyc: zipimport skips the timestamp check when there is no .py
+                dst.writestr(name + "c", importlib.util.MAGIC_NUMBER + bytes(12) + marshal.dumps(code))
+            else:
+                dst.writestr(info, data)
+    os.replace(temp, target)
+    return target
+
+
+def bundle_on_path(timings):
+    """Put the compiled bundle (building it if stale) or else OpenGL.zip itself on sys.path"""
+    path = compiled_bundle_path()
+    try:
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(BUNDLE):
+            started = time.perf_counter()
+            build_compiled_bundle(BUNDLE, path)
+            timings.append(("compile OpenGL.zip (first start)", time.perf_counter() - started))
+    except OSError:
+        path = BUNDLE  # Read-only install: import from source, slower but works
+    sys.path.insert(0, path)
+    return path
+
+
+def import_gl(mode="standard"):
+    """(GL, GLU, GLUT, timings): the PyOpenGL modules plus [(step, seconds)] for the startup report"""
+    timings = []
+    source = "installed PyOpenGL"
+    if importlib.util.find_spec("OpenGL") is None:
+        source = bundle_on_path(timings)
+    if "OpenGL.GL" in sys.modules and GL_MODES[mode]:
+        raise RuntimeError(f"OpenGL.GL was imported before the {mode!r} GL flags could be set")
+    package = importlib.import_module("OpenGL")
+    for flag, value in GL_MODES[mode].items():
+        setattr(package, flag, value)
+    modules = []
+    for name in ("OpenGL.GL", "OpenGL.GLU", "OpenGL.GLUT"):
+        started = time.perf_counter()
+        modules.append(importlib.import_module(name))
+        timings.append((f"import {name}", time.perf_counter() - started))
+    timings.append((f"  from {source} ({mode} mode)", 0.0))
+    return (*modules, timings)
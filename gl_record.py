@@ -0,0 +1,147 @@
+"""Recording stand-in for PyOpenGL: counts draw calls per function, no GL context needed
+
+    python gl_record.py              # call counts per level / theme / camera, checked against FRAME_BUDGETS
+"""
+import argparse
+import inspect
+import re
+import sys
+from collections import Counter
+
+GL_NAME = re.compile(r"\b(?:gl[A-Z]\w*|glu[A-Z]\w*|glut[A-Z]\w*|GL_\w+|GLU_\w+|GLUT_\w+)\b")
+
+# Steady-state Python->GL calls per frame (display lists already compiled)
+FRAME_BUDGETS = {
+    "update_highway_camera": 10,
+    "draw_track_scenery": 2,
+    "draw_highway_road": 250,
+    "draw_game_objects": 240,
+    "draw_fighter_jet": 20,
+    "draw_impostors": 120,
+    "draw_particles": 100,
+    "draw_dashboard_hud": 160,
+}
+
+
+class RecordingGL:
+    """Every gl*/glu*/glut* function is a counter; GL_* constants are distinct ints.
+
+    Calls made while compiling a display list (glNewList..glEndList) go to
+    `compiled` instead of `calls`, since they are paid once, not per frame.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.compiled = Counter()
+        self.compiling = False
+        self.next_list = 1
+
+    def namespace(self, *modules):
+        """GL names used by the given modules, bound to recording functions"""
+        names = set()
+        for module in modules:
+            names.update(GL_NAME.findall(inspect.getsource(module)))
+        namespace = {}
+        for n, name in enumerate(sorted(names)):
+            if name.startswith(("GL_", "GLU_", "GLUT_")):
+                namespace[name] = 0x1000 + n
+            else:
+                namespace[name] = self._recorder(name)
+        return namespace
+
+    def _recorder(self, name):
+        special = getattr(self, "_" + name, None)
+
+        def record(*args, **kwargs):
+            (self.compiled if self.compiling else self.calls)[name] += 1
+            if special is not None:
+                return special(*args)
+        record.__name__ = name
+        return record
+
+    def _glGenLists(self, count):
+        first = self.next_list
+        self.next_list += count
+        return first
+
+    def _glNewList(self, list_id, mode):
+        self.compiling = True
+
+    def _glEndList(self):
+        self.compiling = False
+
+    def _gluNewQuadric(self):
+        return object()
+
+    def measure(self, function, *args):
+        """Counter of the GL calls one call of function makes"""
+        self.calls = Counter()
+        function(*args)
+        counted, self.calls = self.calls, Counter()
+        return counted
+
+
+def frame_report(game, recorder):
+    """Calls per draw phase for the current game state (after a warm-up frame)"""
+    game.display()  # Compile display lists / cached runs first
+    report = {"update_highway_camera": recorder.measure(game.update_highway_camera)}
+    game.view_culler.begin_frame()
+    game.lod.begin_frame(game.view_culler.eye_x, game.view_culler.eye_y)
+    for name in ("draw_track_scenery", "draw_highway_road", "draw_game_objects", "draw_dashboard_hud"):
+        if name == "draw_dashboard_hud":
+            game.begin_text_batch()
+            report[name] = recorder.measure(getattr(game, name))
+            game.end_text_batch()
+        else:
+            report[name] = recorder.measure(getattr(game, name))
+    report["draw_fighter_jet"] = recorder.measure(game.draw_fighter_jet, game.player_jet)
+    report["draw_impostors"] = recorder.measure(game.draw_impostors)
+    report["draw_particles"] = recorder.measure(game.draw_particles)
+    report["display"] = recorder.measure(game.display)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count GL calls per draw phase without a GPU")
+    parser.add_argument("--fleet", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=120, help="simulated ticks before measuring")
+    args = parser.parse_args()
+
+    import test as game
+    import gl_resources
+    import headless
+
+    recorder = RecordingGL()
+    game.load_gl(recorder.namespace(game, gl_resources))
+    over_budget = []
+    columns = [name[5:] if name.startswith("draw_") else name for name in FRAME_BUDGETS]
+    print(f"{'scenario':<28}" + "".join(f"{column:>22}" for column in columns) + f"{'display':>10}")
+    for level in (1, 2, 3):
+        for cyberpunk in (True, False):
+            for first_person in (False, True):
+                headless.start_race(level, 2, autopilot=True, seed=423, fleet=args.fleet)
+                game.cyberpunk_mode = cyberpunk
+                game.first_person_view = first_person
+                for _ in range(args.ticks):
+                    # Keep the player flying so every scenario measures a live HUD
+                    game.player_jet.crashed = False
+                    game.game_state = game.RACING
+                    headless.tick()
+                game.player_jet.crashed = False
+                game.game_state = game.RACING
+                report = frame_report(game, recorder)
+                label = f"L{level} {'cyber' if cyberpunk else 'std'} {'cockpit' if first_person else 'chase'}"
+                cells = ""
+                for name, budget in FRAME_BUDGETS.items():
+                    total = sum(report[name].values())
+                    cells += f"{total:>21}{'!' if total > budget else ' '}"
+                    if total > budget:
+                        over_budget.append((label, name, total, budget))
+                print(f"{label:<28}{cells}{sum(report['display'].values()):>10}")
+    for label, name, total, budget in over_budget:
+        print(f"OVER BUDGET: {label} {name} {total} > {budget}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Owner of the game's GL objects (display lists, quadrics) with session / level / theme lifetimes"""
+import warnings
+
+SESSION = "session"  # Until the window closes
+LEVEL = "level"      # Until the track is rebuilt (next level, restart, new race)
+THEME = "theme"      # Until the theme is switched
+LIFETIMES = (SESSION, LEVEL, THEME)
+
+VERTEX_BYTES = 40    # Position + normal + RGBA color as floats, roughly what a driver keeps per vertex
+LIST_OVERHEAD = 64
+QUADRIC_BYTES = 64
+GROWTH_WINDOW = 600  # Frames between leak checks
+GROWTH_WINDOWS = 3   # Checks in a row with more live objects before warning
+
+
+def sphere_vertices(slices, stacks):
+    """Vertices glutSolidSphere / gluSphere emit (quad strips)"""
+    return 2 * (slices + 1) * stacks
+
+
+def cone_vertices(slices, stacks):
+    return 2 * (slices + 1) * stacks + slices + 2  # Sides plus the base fan
+
+
+class GLResources:
+    """Every display list and quadric is allocated through here with a lifetime.
+
+    gl is looked up on each call (e.g. the game module's globals()), so this
+    works with whatever load_gl bound, PyOpenGL or a recording namespace.
+    release(lifetime) frees everything of that lifetime; end_frame() warns
+    if the number of live objects keeps rising between checks.
+    """
+
+    def __init__(self, gl):
+        self.gl = gl
+        self.lists = {}     # list id -> (lifetime, kind, estimated bytes)
+        self.quadrics = {}  # lifetime -> shared quadric
+        self.allocated = 0
+        self.freed = 0
+        self.frames = 0
+        self.checked_live = 0
+        self.growing = 0
+
+    def new_list(self, lifetime, kind, vertices=0):
+        """A fresh display list id; kind and vertices (an estimate) are for the report"""
+        list_id = self.gl["glGenLists"](1)
+        self.lists[list_id] = (lifetime, kind, LIST_OVERHEAD + vertices * VERTEX_BYTES)
+        self.allocated += 1
+        return list_id
+
+    def delete_list(self, list_id):
+        if self.lists.pop(list_id, None) is not None:
+            self.gl["glDeleteLists"](list_id, 1)
+            self.freed += 1
+
+    def quadric(self, lifetime=SESSION):
+        """The shared GLU quadric for a lifetime (created on first use)"""
+        quadric = self.quadrics.get(lifetime)
+        if quadric is None:
+            quadric = self.quadrics[lifetime] = self.gl["gluNewQuadric"]()
+            self.allocated += 1
+        return quadric
+
+    def release(self, lifetime):
+        """Free every list and quadric of a lifetime"""
+        for list_id in [k for k, (owner, _, _) in self.lists.items() if owner == lifetime]:
+            self.delete_list(list_id)
+        quadric = self.quadrics.pop(lifetime, None)
+        if quadric is not None:
+            self.gl["gluDeleteQuadric"](quadric)
+            self.freed += 1
+
+    def live(self):
+        return len(self.lists) + len(self.quadrics)
+
+    def estimated_bytes(self):
+        return sum(nbytes for _, _, nbytes in self.lists.values()) + QUADRIC_BYTES * len(self.quadrics)
+
+    def report(self):
+        """{lifetime: {kind: (count, estimated bytes)}} of what is live"""
+        report = {lifetime: {} for lifetime in LIFETIMES}
+        for lifetime, kind, nbytes in self.lists.values():
+            count, total = report[lifetime].get(kind, (0, 0))
+            report[lifetime][kind] = (count + 1, total + nbytes)
+        for lifetime in self.quadrics:
+            count, total = report[lifetime].get("quadric", (0, 0))
+            report[lifetime]["quadric"] = (count + 1, total + QUADRIC_BYTES)
+        return report
+
+    def end_frame(self):
+        """Leak check: warn once the live count has grown over GROWTH_WINDOWS windows running"""
+        self.frames += 1
+        if self.frames % GROWTH_WINDOW:
+            return
+        live = self.live()
+        self.growing = self.growing + 1 if live > self.checked_live else 0
+        self.checked_live = live
+        if self.growing == GROWTH_WINDOWS:
+            warnings.warn(f"GL objects keep piling up: {live} live after {self.frames} frames "
+                          f"({self.allocated} allocated, {self.freed} freed)", RuntimeWarning, stacklevel=2)
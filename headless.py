@@ -0,0 +1,92 @@
+"""Headless race runner: steps the game simulation as fast as possible, no OpenGL
+
+    python headless.py --level 2 --difficulty 3 --races 500
+"""
+import argparse
+import time
+
+import test as game
+
+SIM_DT = game.SIM_DT
+MAX_RACE_SECONDS = 600.0
+
+
+def start_race(level=1, difficulty=1, autopilot=True, seed=None, fleet=0, endless=False):
+    """Reset the game module and launch a race without a window"""
+    game.fleet_size = fleet
+    game.endless_mode = endless
+    game.current_level = level
+    game.custom_difficulty = difficulty
+    game.coins_collected = 0
+    game.level_cleared = False
+    for key in game.keys:
+        game.keys[key] = False
+    game.begin_race(seed)
+    game.cheat_mode = autopilot
+    if not autopilot:
+        game.keys[b'w'] = True  # Full throttle, no steering
+
+
+def tick(dt=SIM_DT):
+    """Advance the game by one step"""
+    game.update_highway_game(dt)
+
+
+def race_result(ticks):
+    player = game.player_jet
+    return {
+        "level": game.current_level,
+        "difficulty": game.custom_difficulty,
+        "won": game.level_cleared,
+        "crashed": player.crashed,
+        "crash_cause": player.crash_cause,
+        "timed_out": game.game_state == game.RACING,
+        "finished": player.finished,
+        "race_time": player.race_time if player.finished else None,
+        "coins": game.coins_collected,
+        "distance": player.y,
+        "ticks": ticks,
+    }
+
+
+def run_race(level=1, difficulty=1, autopilot=True, seed=None, dt=SIM_DT,
+             max_time=MAX_RACE_SECONDS, fleet=0, endless=False):
+    """Run one race to completion (or max_time simulated seconds) and return its result"""
+    start_race(level, difficulty, autopilot, seed, fleet, endless)
+    ticks = 0
+    while game.game_state == game.RACING and game.sim_clock - game.race_start_time < max_time:
+        tick(dt)
+        ticks += 1
+    return race_result(ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Jet Racer races without a display")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--difficulty", type=int, default=1, choices=[1, 2, 3])
+    parser.add_argument("--races", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--pilot", choices=["auto", "throttle"], default="auto")
+    parser.add_argument("--dt", type=float, default=SIM_DT)
+    parser.add_argument("--fleet", type=int, default=0, help="extra AI jets (fleet mode)")
+    parser.add_argument("--endless", action="store_true", help="streamed track, race until a crash")
+    parser.add_argument("--max-time", type=float, default=MAX_RACE_SECONDS, help="simulated seconds per race")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    wins = crashes = 0
+    for n in range(args.races):
+        seed = None if args.seed is None else args.seed + n
+        result = run_race(args.level, args.difficulty, args.pilot == "auto", seed, args.dt,
+                          args.max_time, args.fleet, args.endless)
+        wins += result["won"]
+        crashes += result["crashed"]
+        if args.races == 1:
+            print(result)
+    elapsed = time.perf_counter() - start
+    print(f"{args.races} race(s) in {elapsed:.3f}s ({elapsed / args.races * 1000:.2f} ms/race)")
+    print(f"Wins: {wins}  Crashes: {crashes}")
+
+
+if __name__ == "__main__":
+    main()
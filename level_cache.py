@@ -0,0 +1,117 @@
+"""On-disk cache of generated level layouts, keyed by level and seed and loaded with mmap
+
+File layout (little endian): a 64-byte header, then the coin x/y/z and obstacle
+x/y/z columns as doubles, then the coin and obstacle kinds as bytes. Columns
+are stored in ItemStore order (sorted by y), so the y column is the spatial
+index and loading is just mapping the file.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from world import ItemStore
+
+MAGIC = b"JLC1"
+LAYOUT_VERSION = 1  # Bump whenever generate_level_objects changes its output
+# magic, version, road length, coin count, obstacle count, shield x, y, z, has shield
+HEADER = struct.Struct("<4sHdII3d?")
+HEADER_SIZE = 64  # Padded so the double columns start 8-byte aligned
+MAX_FILES = 64    # Oldest layouts are deleted past this many
+
+
+class LevelCache:
+    """Directory of level layout files. load() maps a file and wraps it without copying.
+
+    The stores returned by load() read the mapping directly, so it stays open
+    until the next load() (or close()), which releases it: by then the level
+    it belongs to has been replaced.
+    """
+
+    def __init__(self, directory, max_files=MAX_FILES):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self.mapped = None
+        self.views = []
+
+    def close(self):
+        """Release the views of the last loaded layout and unmap its file"""
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+
+    def path(self, level, seed):
+        return os.path.join(self.directory, f"level{level}-{seed}.jlc")
+
+    def load(self, level, seed, road_length):
+        """(coins, obstacles, shield_token) for a cached layout, or None.
+        A missing, stale, truncated or corrupt file is a miss (store() then replaces it)."""
+        self.close()
+        try:
+            with open(self.path(level, seed), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # ValueError: empty file
+            self.misses += 1
+            return None
+        try:
+            magic, version, length, coin_count, obstacle_count, sx, sy, sz, has_shield = \
+                HEADER.unpack_from(mapped)
+        except struct.error:  # Shorter than the header
+            magic = None
+        if (magic != MAGIC or version != LAYOUT_VERSION or length != road_length or sys.byteorder != "little"
+                or len(mapped) != HEADER_SIZE + 25 * (coin_count + obstacle_count)):
+            mapped.close()
+            self.misses += 1
+            return None
+
+        view = memoryview(mapped)
+        doubles = view[HEADER_SIZE:HEADER_SIZE + 24 * (coin_count + obstacle_count)].cast('d')
+        kinds = view[HEADER_SIZE + 24 * (coin_count + obstacle_count):].cast('b')
+
+        def columns(offset, count):
+            return [doubles[offset + n * count:offset + (n + 1) * count] for n in range(3)]
+
+        coin_columns = columns(0, coin_count) + [kinds[:coin_count]]
+        obstacle_columns = (columns(3 * coin_count, obstacle_count)
+                            + [kinds[coin_count:coin_count + obstacle_count]])
+        self.mapped = mapped
+        self.views = [view, doubles, kinds] + coin_columns + obstacle_columns
+        self.hits += 1
+        return (ItemStore.from_columns(*coin_columns), ItemStore.from_columns(*obstacle_columns),
+                ([sx, sy, sz, True] if has_shield else None))
+
+    def store(self, level, seed, road_length, coins, obstacles, shield_token):
+        """Write a freshly generated layout (replaces the file atomically)"""
+        shield = shield_token or (0.0, 0.0, 0.0)
+        header = HEADER.pack(MAGIC, LAYOUT_VERSION, road_length, len(coins.y), len(obstacles.y),
+                             shield[0], shield[1], shield[2], shield_token is not None)
+        path = self.path(level, seed)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            for store in (coins, obstacles):
+                for column in (store.x, store.y, store.z):
+                    array('d', column).tofile(f)
+            array('b', coins.kind).tofile(f)
+            array('b', obstacles.kind).tofile(f)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Delete the oldest layout files past max_files"""
+        paths = [entry.path for entry in os.scandir(self.directory) if entry.name.endswith(".jlc")]
+        if len(paths) <= self.max_files:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # Another process got there first
+                pass
@@ -0,0 +1,60 @@
+"""Distance level of detail: coarser tessellation further out, point impostors at the far end"""
+
+FULL, REDUCED, IMPOSTOR = 0, 1, 2
+BAND_LIMITS = (800.0, 2500.0)  # Camera distance where FULL and REDUCED end
+HYSTERESIS = 0.1               # Go coarser at limit * 1.1, back finer at limit * 0.9
+
+
+class LodSelector:
+    """Picks a detail level per object from its distance to the camera.
+
+    The level an object had last frame is remembered (by key) so it only
+    changes once the distance is clearly past a band limit; objects sitting
+    on a limit don't flicker between meshes. Impostors are collected here
+    by color and drawn as one GL_POINTS batch at the end of the frame.
+    """
+
+    def __init__(self, limits=BAND_LIMITS, hysteresis=HYSTERESIS):
+        self.coarser_sq = [(limit * (1 + hysteresis)) ** 2 for limit in limits]
+        self.finer_sq = [(limit * (1 - hysteresis)) ** 2 for limit in limits]
+        self.plain_sq = [limit * limit for limit in limits]
+        self.eye_x = self.eye_y = 0.0
+        self.previous = {}
+        self.current = {}
+        self.counts = [0, 0, 0]
+        self.impostors = {}  # color -> [x, y, z, x, y, z, ...]
+
+    def begin_frame(self, eye_x, eye_y):
+        self.eye_x, self.eye_y = eye_x, eye_y
+        # Only what was drawn last frame carries its level over
+        self.previous, self.current = self.current, {}
+        self.counts = [0, 0, 0]
+        self.impostors = {}
+
+    def level(self, key, x, y):
+        dx, dy = x - self.eye_x, y - self.eye_y
+        d_sq = dx * dx + dy * dy
+        level = self.previous.get(key)
+        if level is None:
+            level = FULL
+            while level < IMPOSTOR and d_sq > self.plain_sq[level]:
+                level += 1
+        else:
+            while level < IMPOSTOR and d_sq > self.coarser_sq[level]:
+                level += 1
+            while level > FULL and d_sq < self.finer_sq[level - 1]:
+                level -= 1
+        self.current[key] = level
+        self.counts[level] += 1
+        return level
+
+    def add_impostor(self, color, x, y, z):
+        points = self.impostors.get(color)
+        if points is None:
+            points = self.impostors[color] = []
+        points += (x, y, z)
+
+
+def segments(n, level):
+    """Slices / stacks to use at a level for a primitive that has n at FULL"""
+    return n if level == FULL else max(4, n // 2)
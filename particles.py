@@ -0,0 +1,130 @@
+"""Pooled particles (engine exhaust, explosions, impact sparks) drawn from one preallocated vertex array"""
+import ctypes
+import math
+import random
+from array import array
+
+PATTERN_SIZE = 4096   # Unit-spread velocities shared by every burst
+MAX_BURST = 1024      # Particles in one burst at most
+MAX_BURSTS = 256      # Live bursts; a new one past this replaces the oldest
+PLUME_SIZE = 160      # Exhaust plume points behind the two engines
+MAX_PLUMES = 24       # Jets with exhaust drawn per frame; the player and named AI come first
+
+
+class ParticlePool:
+    """Particles come in bursts that share a start point, start time, color and spread.
+
+    Within a burst the particles differ only in their velocity, so where they
+    are at age t is
+
+        origin + base_velocity * t + spread * t * u + (0, 0, gravity * t * t / 2)
+
+    with u a fixed window of a random unit-spread pattern. That is a translate
+    and a scale of the pattern, so a burst is drawn as one glDrawArrays slice
+    of the shared vertex array under a matrix computed per burst. Emitting and
+    updating cost the same for 10 particles or 1000, and nothing is allocated
+    per particle. Bursts are records in fixed arrays, reused oldest first.
+
+    Exhaust plumes are the other way round: one small cloud per jet, every
+    frame. place_plumes() writes them all into plume_vertices so they go out
+    as a single glDrawArrays however many jets there are.
+    """
+
+    def __init__(self, seed=0):
+        rng = random.Random(seed)
+        gauss = rng.gauss
+        vertices = array('f', bytes(12 * PATTERN_SIZE))
+        for k in range(3 * PATTERN_SIZE):
+            vertices[k] = gauss(0.0, 1.0)
+        # Shares the array's memory; PyOpenGL takes ctypes arrays as they are
+        self.vertices = (ctypes.c_float * len(vertices)).from_buffer(vertices)
+        # A stretched cloud trailing back from the two engines (+-2.5 either side of the nozzle point)
+        self.plume_points = [((2.5 if i % 2 else -2.5) + gauss(0.0, 0.5), -rng.expovariate(1 / 6),
+                              gauss(0.0, 0.5)) for i in range(PLUME_SIZE)]
+        self.plume_xyz = array('f', bytes(12 * PLUME_SIZE * MAX_PLUMES))
+        self.plume_vertices = (ctypes.c_float * len(self.plume_xyz)).from_buffer(self.plume_xyz)
+
+        self.rng = rng
+        self.offset = array('l', [0]) * MAX_BURSTS
+        self.count = array('l', [0]) * MAX_BURSTS
+        self.birth = array('d', [0.0]) * MAX_BURSTS
+        self.life = array('d', [0.0]) * MAX_BURSTS
+        self.origin = array('d', [0.0]) * (3 * MAX_BURSTS)
+        self.velocity = array('d', [0.0]) * (2 * MAX_BURSTS)  # Base vx, vy
+        self.spread = array('d', [0.0]) * MAX_BURSTS
+        self.gravity = array('d', [0.0]) * MAX_BURSTS
+        self.color = array('d', [0.0]) * (3 * MAX_BURSTS)
+        self.alive = bytearray(MAX_BURSTS)
+        self.next_burst = 0
+        self.live = 0
+
+    def clear(self):
+        self.alive[:] = bytes(MAX_BURSTS)
+        self.live = 0
+
+    def particles(self):
+        """Live particle count"""
+        return sum(self.count[b] for b in range(MAX_BURSTS) if self.alive[b])
+
+    def burst(self, now, x, y, z, count, spread, color, life, gravity=0.0, vx=0.0, vy=0.0):
+        """Emit count particles from (x, y, z) at time now; they scatter at about
+        spread units/s around (vx, vy) and fade out over life seconds"""
+        b = self.next_burst
+        self.next_burst = (b + 1) % MAX_BURSTS
+        if not self.alive[b]:
+            self.live += 1
+        count = min(count, MAX_BURST)
+        self.offset[b] = self.rng.randrange(PATTERN_SIZE - count + 1)  # A different cloud each time
+        self.count[b] = count
+        self.birth[b] = now
+        self.life[b] = life
+        self.origin[3 * b], self.origin[3 * b + 1], self.origin[3 * b + 2] = x, y, z
+        self.velocity[2 * b], self.velocity[2 * b + 1] = vx, vy
+        self.spread[b] = spread
+        self.gravity[b] = gravity
+        self.color[3 * b], self.color[3 * b + 1], self.color[3 * b + 2] = color
+        self.alive[b] = 1
+
+    def place_plumes(self, nozzles):
+        """Write the plume of each (x, y, z, rotation, bank, pulse) nozzle into
+        plume_vertices, in world space; returns the point count. A nozzle is
+        placed as the jet's matrix would: translate, rotate about z then y
+        (degrees), 21 units back, stretched by pulse along the jet."""
+        xyz, points = self.plume_xyz, self.plume_points
+        n = 0
+        for x, y, z, rotation, bank, pulse in nozzles[:MAX_PLUMES]:
+            rotation, bank = math.radians(rotation), math.radians(bank)
+            cr, sr, cb, sb = math.cos(rotation), math.sin(rotation), math.cos(bank), math.sin(bank)
+            # Columns of the matrix (without the translation), and where the nozzle ends up
+            ax, ay, az = cr * cb, sr * cb, -sb
+            bx, by = -sr * pulse, cr * pulse
+            cx, cy, cz = cr * sb, sr * sb, cb
+            x, y = x + 21 * sr, y - 21 * cr
+            k = 3 * n
+            end = k + 3 * PLUME_SIZE
+            xyz[k:end:3] = array('f', [x + ax * u + bx * v + cx * w for u, v, w in points])
+            xyz[k + 1:end:3] = array('f', [y + ay * u + by * v + cy * w for u, v, w in points])
+            xyz[k + 2:end:3] = array('f', [z + az * u + cz * w for u, v, w in points])
+            n += PLUME_SIZE
+        return n
+
+    def draws(self, now, y_min=-math.inf, y_max=math.inf):
+        """(first, count, translate xyz, scale, rgba) for each live burst whose
+        origin is in [y_min, y_max]; retires the bursts that have faded out"""
+        alive, birth, life = self.alive, self.birth, self.life
+        origin, velocity, color = self.origin, self.velocity, self.color
+        for b in range(MAX_BURSTS):
+            if not alive[b]:
+                continue
+            t = now - birth[b]
+            if not 0 <= t < life[b]:
+                alive[b] = 0
+                self.live -= 1
+                continue
+            y = origin[3 * b + 1] + velocity[2 * b + 1] * t
+            if not y_min <= y <= y_max:
+                continue
+            yield (self.offset[b], self.count[b],
+                   origin[3 * b] + velocity[2 * b] * t, y, origin[3 * b + 2] + 0.5 * self.gravity[b] * t * t,
+                   self.spread[b] * t,
+                   color[3 * b], color[3 * b + 1], color[3 * b + 2], 1.0 - t / life[b])
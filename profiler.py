@@ -0,0 +1,74 @@
+"""Per-phase frame timing: fixed-size ring buffers, percentiles and CSV export"""
+import csv
+import time
+from array import array
+
+
+class FrameProfiler:
+    """Times named phases of each frame. start()/stop() cost one attribute check when disabled."""
+
+    def __init__(self, phases, capacity=600):
+        self.phases = list(phases)
+        self.capacity = capacity
+        self.enabled = False
+        self.rings = {phase: array('d', [0.0]) * capacity for phase in self.phases}
+        self.frame_ring = array('d', [0.0]) * capacity  # Wall time between frames
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self.index = 0
+        self.count = 0
+        self.last_frame_end = None
+        self.recording = False
+        self.rows = []
+
+    def start(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, phase, started):
+        if self.enabled:
+            self.current[phase] += time.perf_counter() - started
+
+    def end_frame(self, game_seconds=0.0):
+        """Commit this frame's phase times to the rings (and the CSV rows if recording)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame = now - self.last_frame_end if self.last_frame_end is not None else 0.0
+        self.last_frame_end = now
+        i = self.index
+        self.frame_ring[i] = frame
+        for phase in self.phases:
+            self.rings[phase][i] = self.current[phase]
+        if self.recording:
+            self.rows.append((game_seconds, frame) + tuple(self.current[p] for p in self.phases))
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self.index = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def percentiles(self, ring, points=(50, 99)):
+        samples = sorted(ring[:self.count]) if self.count < self.capacity else sorted(ring)
+        if not samples:
+            return [0.0 for _ in points]
+        return [samples[min(len(samples) - 1, len(samples) * p // 100)] for p in points]
+
+    def summary(self):
+        """[(phase, p50_ms, p99_ms)] over the ring window"""
+        return [(phase, *(t * 1000 for t in self.percentiles(self.rings[phase])))
+                for phase in self.phases]
+
+    def fps(self):
+        frames = self.frame_ring[:self.count]
+        total = sum(frames)
+        return len(frames) / total if total else 0.0
+
+    def start_recording(self):
+        self.rows = []
+        self.recording = True
+
+    def dump_csv(self, path):
+        """Write every frame recorded since start_recording (times in ms)"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "game_time", "frame_ms"] + [f"{p}_ms" for p in self.phases])
+            for n, row in enumerate(self.rows):
+                writer.writerow([n, f"{row[0]:.4f}"] + [f"{t * 1000:.4f}" for t in row[1:]])
+        self.recording = False
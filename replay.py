@@ -0,0 +1,145 @@
+"""Compact input recordings (one byte per tick, run-length encoded) and headless replay
+
+    python test.py --record race.jrr     # play; the latest race is saved
+    python replay.py race.jrr            # re-run it headless at full speed
+"""
+import argparse
+import struct
+import time
+
+MAGIC = b"JRR1"
+# magic, seed, level, difficulty, fleet size, sim Hz, flags, tick count
+HEADER = struct.Struct("<4sIBBIHBI")
+FLAG_AUTOPILOT = 0x01   # Autopilot on at the start
+FLAG_ENDLESS = 0x02
+
+# Per-tick input byte
+KEY_BITS = {b'w': 0x01, b's': 0x02, b'a': 0x04, b'd': 0x08}
+CHEAT_TOGGLE = 0x10
+SHOT_SHIFT = 5          # Bits 5-6: shots fired this tick (0-3)
+MAX_SHOTS_PER_TICK = 3
+
+
+def encode_inputs(keys, shots, cheat_toggled):
+    bits = 0
+    for key, bit in KEY_BITS.items():
+        if keys.get(key):
+            bits |= bit
+    if cheat_toggled:
+        bits |= CHEAT_TOGGLE
+    return bits | (min(shots, MAX_SHOTS_PER_TICK) << SHOT_SHIFT)
+
+
+def decode_inputs(bits):
+    """(held keys dict, shots, cheat toggled)"""
+    held = {key: bool(bits & bit) for key, bit in KEY_BITS.items()}
+    return held, (bits >> SHOT_SHIFT) & MAX_SHOTS_PER_TICK, bool(bits & CHEAT_TOGGLE)
+
+
+class InputRecorder:
+    """Input bytes for every simulated race tick, stored as (byte, run length) pairs"""
+
+    def __init__(self, seed, level, difficulty, fleet_size, sim_hz, autopilot, race_serial=0, endless=False):
+        self.seed = seed
+        self.level = level
+        self.difficulty = difficulty
+        self.fleet_size = fleet_size
+        self.sim_hz = sim_hz
+        self.autopilot = autopilot
+        self.race_serial = race_serial
+        self.endless = endless
+        self.runs = bytearray()
+        self.ticks = 0
+
+    def record(self, bits):
+        runs = self.runs
+        if runs and runs[-2] == bits and runs[-1] < 255:
+            runs[-1] += 1
+        else:
+            runs += bytes((bits, 1))
+        self.ticks += 1
+
+    def truncate(self, ticks):
+        """Forget every tick from ticks on (the race was rewound to there)"""
+        runs, kept = self.runs, 0
+        for i in range(0, len(runs), 2):
+            if kept + runs[i + 1] >= ticks:
+                runs[i + 1] = ticks - kept
+                del runs[i + 2 if runs[i + 1] else i:]
+                break
+            kept += runs[i + 1]
+        self.ticks = min(self.ticks, ticks)
+
+    def inputs(self):
+        """Yield the per-tick input bytes"""
+        runs = self.runs
+        for i in range(0, len(runs), 2):
+            for _ in range(runs[i + 1]):
+                yield runs[i]
+
+    def to_bytes(self):
+        flags = (FLAG_AUTOPILOT if self.autopilot else 0) | (FLAG_ENDLESS if self.endless else 0)
+        header = HEADER.pack(MAGIC, self.seed, self.level, self.difficulty, self.fleet_size,
+                             self.sim_hz, flags, self.ticks)
+        return header + bytes(self.runs)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, seed, level, difficulty, fleet_size, sim_hz, flags, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a Jet Racer recording")
+        recording = cls(seed, level, difficulty, fleet_size, sim_hz, bool(flags & FLAG_AUTOPILOT),
+                        endless=bool(flags & FLAG_ENDLESS))
+        recording.runs = bytearray(data[HEADER.size:])
+        recording.ticks = ticks
+        return recording
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def replay(recording):
+    """Re-run a recorded race headless as fast as possible; returns the race result"""
+    import test as game
+    import headless
+
+    if recording.sim_hz != game.SIM_HZ:
+        raise ValueError(f"recorded at {recording.sim_hz} Hz, game runs at {game.SIM_HZ} Hz")
+    headless.start_race(recording.level, recording.difficulty, recording.autopilot,
+                        recording.seed, recording.fleet_size, recording.endless)
+    ticks = 0
+    for bits in recording.inputs():
+        if game.game_state != game.RACING:
+            break
+        held, shots, cheat_toggled = decode_inputs(bits)
+        game.keys.update(held)
+        game.queued_shots += shots
+        game.cheat_toggle_queued = cheat_toggled
+        headless.tick()
+        ticks += 1
+    return headless.race_result(ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded race without a display")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    recording = InputRecorder.load(args.path)
+    start = time.perf_counter()
+    result = replay(recording)
+    elapsed = time.perf_counter() - start
+    print(f"seed {recording.seed}, level {recording.level}, {recording.ticks} ticks "
+          f"({len(recording.runs)} bytes of input)")
+    print(result)
+    print(f"Replayed in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Ring of recent world snapshots for rewinding a race"""
+
+
+class SnapshotRing:
+    """The last capacity snapshots, each stored with the sim time it was taken at.
+
+    Slots are reused oldest first, so memory stays fixed however long the
+    race runs. rewind() also forgets the snapshots from the one it returns
+    on: that future is being replaced.
+    """
+
+    def __init__(self, capacity):
+        self.times = [0.0] * capacity
+        self.slots = [None] * capacity
+        self.next = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.size = 0
+
+    def push(self, time, snapshot):
+        self.times[self.next] = time
+        self.slots[self.next] = snapshot
+        self.next = (self.next + 1) % len(self.slots)
+        self.size = min(self.size + 1, len(self.slots))
+
+    def rewind(self, time):
+        """(time, snapshot) of the newest snapshot taken at or before time (the
+        oldest kept if none is that old); None if the ring is empty. It is
+        dropped along with the newer ones, and pushed again when the race
+        gets back to that time."""
+        capacity = len(self.slots)
+        newest = (self.next - 1) % capacity
+        for back in range(self.size):
+            k = (newest - back) % capacity
+            if self.times[k] <= time or back == self.size - 1:
+                self.next = k
+                self.size -= back + 1
+                return self.times[k], self.slots[k]
+        return None
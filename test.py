@@ -1,9 +1,39 @@
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
+import json
 import math
+import os
 import time
 import random
+import argparse
+from operator import attrgetter
+
+from autopilot import LanePlanner
+from bullets import BulletPool
+from culling import ViewCuller
+from fleet import FAR_INTERVAL, NEAR_RANGE, JetFleet, far_rates, far_velocity_y
+from gl_resources import LEVEL, SESSION, THEME, GLResources, cone_vertices, sphere_vertices
+from level_cache import LevelCache
+from lod import FULL, IMPOSTOR, LodSelector, segments
+from particles import ParticlePool
+from profiler import FrameProfiler
+from replay import MAX_SHOTS_PER_TICK, InputRecorder, encode_inputs
+from snapshot import SnapshotRing
+from track import TrackStream
+from world import ItemStore, overlapping_pairs
+
+def load_gl(namespace=None, mode="standard"):
+    """Bind the OpenGL/GLUT/GLU names into this module (only needed to render).
+    A namespace dict (e.g. gl_record.RecordingGL().namespace(...)) replaces PyOpenGL;
+    mode picks the PyOpenGL checking flags (gl_loader.GL_MODES).
+    Returns the import timings for the startup report."""
+    if namespace is not None:
+        globals().update(namespace)
+        return []
+    from gl_loader import import_gl
+    GL, GLU, GLUT, timings = import_gl(mode)
+    for module in (GL, GLUT, GLU):
+        names = getattr(module, "__all__", None) or [n for n in dir(module) if not n.startswith("_")]
+        globals().update((name, getattr(module, name)) for name in names)
+    return timings
 
 # ===== HIGHWAY DASH 3D: COMBAT EDITION (Cheat Mode Update) =====
 WINDOW_WIDTH = 1200
@@ -24,6 +54,49 @@ last_time = time.time()
 level_cleared = False
 cheat_mode = False # NEW: Cheat Mode Flag
 
+# Fixed-timestep simulation (see idle)
+SIM_HZ = 120
+SIM_DT = 1.0 / SIM_HZ
+MAX_STEPS_PER_FRAME = 12   # 0.1 s of catch-up, then drop time instead of spiralling
+sim_accumulator = 0.0
+render_alpha = 1.0         # Blend between previous and current tick when drawing
+
+# --startup-report: [(step, seconds)] printed once the first frame is on screen
+startup_report = None
+startup_started = 0.0
+bench_frames = 0  # --bench-frames: frames left before printing the timings and exiting
+bench_seed = 423
+
+# Frame profiler (F toggles the overlay, --profile-csv records each race)
+PROFILE_PHASES = ("sim", "camera", "scenery", "road", "jets", "fx", "hud")
+profiler = FrameProfiler(PROFILE_PHASES)
+show_profiler = False
+profile_csv_path = None
+
+# Game clock: advances SIM_DT per racing tick (pauses don't count)
+sim_clock = 0.0
+
+def game_time():
+    """Current game time in seconds"""
+    return sim_clock
+
+# Seeded per-race random streams (see seed_race)
+base_seed = None          # --seed: every level gets a fixed layout seed
+race_seed = 0
+race_serial = 0           # Bumped on every race start
+level_rng = random.Random()   # Track layout
+ai_rng = random.Random()      # AI grid placement
+fx_rng = random.Random()      # Visual noise only, never touches the simulation
+level_cache = None            # LevelCache: layouts reused by (level, seed)
+
+# Inputs applied at the next tick so recordings replay exactly
+queued_shots = 0
+cheat_toggle_queued = False
+trigger_held = False          # Left button down (the minigun fires a round every tick while it is)
+minigun_mode = False
+record_path = None
+input_recorder = None
+
 # Theme
 cyberpunk_mode = True  
 
@@ -42,7 +115,11 @@ ROAD_WIDTH = 1200
 ROAD_LENGTH = 3000 + (current_level * 2000)
 FINISH_LINE_POSITION = ROAD_LENGTH - 200
 
-# Physics
+# Endless mode: no finish line, the track streams in chunks (see stream_track)
+endless_mode = False
+track_stream = None
+
+# Physics (per-frame constants are tuned for 60 FPS and scaled by dt * 60)
 FRICTION = 0.95
 AIR_RESISTANCE = 0.99
 MAX_SPEED_LIMIT = 50 
@@ -50,12 +127,38 @@ MAX_SPEED_LIMIT = 50
 # Camera
 camera_distance = 250
 camera_height = 120
+VIEW_DISTANCE = 5000  # gluPerspective far plane
+view_culler = ViewCuller(VIEW_DISTANCE, WINDOW_WIDTH / WINDOW_HEIGHT)
+lod = LodSelector()  # Tessellation by camera distance; the farthest things are points
+IMPOSTOR_POINT_SIZE = 4
+
+# Explosions, sparks and exhaust (render only; the sim just emits bursts)
+particles = ParticlePool()
+PARTICLE_POINT_SIZE = 3
+exhaust_nozzles = [] # (x, y, z, rotation, bank, pulse) of the jets drawn this frame
 
 # Collectibles, Obstacles & Bullets
-coin_positions = []
+coin_positions = ItemStore()  # Coins (x, y, z arrays + alive mask)
 shield_token = None 
-obstacles = []      
-bullets = []        # [x, y, z, vx, vy]
+obstacles = ItemStore()       # Obstacles (kind 0 = Cube, 1 = Cone)
+bullets = BulletPool()  # Fixed-capacity pool, see bullets.py
+BULLET_POINT_SIZE = 4
+
+# Every display list and quadric goes through gl_resources (session / level / theme lifetimes)
+gl_resources = GLResources(globals())
+
+# Static scenery display lists (see build_track_geometry)
+TRACK_CHUNK_LENGTH = 1000
+TRACK_LOOKAHEAD = VIEW_DISTANCE + TRACK_CHUNK_LENGTH  # Endless: generated this far past the leader
+track_chunk_lists = {}  # chunk number -> display list
+ENDLESS_GROUND_LENGTH = VIEW_DISTANCE + 3 * TRACK_CHUNK_LENGTH
+scenery_list = None
+track_geometry_dirty = True
+jet_meshes = {}  # (color, crashed, is_player, lod level) -> display list, for the current theme
+
+# HUD text (see begin_text_batch)
+text_batch_active = False
+text_run_lists = {}  # (text, size) -> display list of glyphs
 
 # Auto restart
 AUTO_RESTART_SECONDS = 3.0
@@ -63,21 +166,38 @@ game_complete_time = None
 
 def generate_level_objects():
     """Generate Coins, Shield, and OBSTACLES based on LEVEL"""
-    global coin_positions, shield_token, obstacles, bullets, current_level
-    coin_positions = []
-    obstacles = []
-    bullets = [] # Clear bullets on new level
+    global coin_positions, shield_token, obstacles, current_level, track_geometry_dirty
+    global ROAD_LENGTH, FINISH_LINE_POSITION, track_stream
+    bullets.clear() # Clear bullets on new level
+    track_geometry_dirty = True # Road length may have changed
+
+    if endless_mode:
+        # Same rules, generated chunk by chunk as the race goes
+        ROAD_LENGTH = FINISH_LINE_POSITION = math.inf
+        track_stream = TrackStream(level_rng, current_level, ROAD_WIDTH, TRACK_CHUNK_LENGTH)
+        coin_positions, obstacles = track_stream.coins, track_stream.obstacles
+        track_stream.advance(TRACK_LOOKAHEAD, 0)
+        shield_token = track_stream.next_shield(None, 0)
+        return
+
+    if level_cache is not None:
+        layout = level_cache.load(current_level, race_seed, ROAD_LENGTH)
+        if layout is not None:
+            coin_positions, obstacles, shield_token = layout
+            return
     
     # 1. Generate Coins
+    coin_xs, coin_ys = [], []
     y_pos = 200
     while y_pos < ROAD_LENGTH - 500:
-        x_pos = random.uniform(-ROAD_WIDTH/3, ROAD_WIDTH/3)
-        coin_positions.append([x_pos, y_pos, 30, True]) 
-        y_pos += random.uniform(200, 500)
+        coin_xs.append(level_rng.uniform(-ROAD_WIDTH/3, ROAD_WIDTH/3))
+        coin_ys.append(y_pos)
+        y_pos += level_rng.uniform(200, 500)
+    coin_positions = ItemStore(coin_xs, coin_ys, [30] * len(coin_ys), [0] * len(coin_ys))
 
     # 2. Generate ONE Shield Token
-    shield_x = random.uniform(-ROAD_WIDTH/3, ROAD_WIDTH/3)
-    shield_y = random.uniform(ROAD_LENGTH * 0.3, ROAD_LENGTH * 0.8)
+    shield_x = level_rng.uniform(-ROAD_WIDTH/3, ROAD_WIDTH/3)
+    shield_y = level_rng.uniform(ROAD_LENGTH * 0.3, ROAD_LENGTH * 0.8)
     shield_token = [shield_x, shield_y, 30, True]
 
     # 3. Generate Obstacles (SCALING DIFFICULTY)
@@ -86,23 +206,46 @@ def generate_level_objects():
     # Level 3: 16 obstacles
     num_obstacles = 8 + ((current_level - 1) * 4)
 
+    obs_xs, obs_ys, obs_types = [], [], []
     for _ in range(num_obstacles):
-        ox = random.uniform(-ROAD_WIDTH/3, ROAD_WIDTH/3)
+        obs_xs.append(level_rng.uniform(-ROAD_WIDTH/3, ROAD_WIDTH/3))
         # Ensure obstacles are spread out over the new, longer road lengths
-        oy = random.uniform(400, ROAD_LENGTH - 400)
-        otype = random.choice([0, 1]) # 0 = Cube, 1 = Cone
-        obstacles.append([ox, oy, 30, otype])
+        obs_ys.append(level_rng.uniform(400, ROAD_LENGTH - 400))
+        obs_types.append(level_rng.choice([0, 1])) # 0 = Cube, 1 = Cone
+    obstacles = ItemStore(obs_xs, obs_ys, [30] * num_obstacles, obs_types)
+
+    if level_cache is not None:
+        level_cache.store(current_level, race_seed, ROAD_LENGTH, coin_positions, obstacles, shield_token)
 
-def detect_car_collision(car1, car2):
-    """Detect collision between two jets"""
-    dx = car1.x - car2.x
-    dy = car1.y - car2.y
-    distance = math.sqrt(dx**2 + dy**2)
-    return distance < 80  
+def stream_track():
+    """Endless mode: generate ahead of the leading jet, evict behind the last jet and the camera"""
+    global shield_token
+    lead = tail = player_jet.y
+    for jet in ai_jets:
+        if not jet.crashed:
+            lead = max(lead, jet.y)
+            tail = min(tail, jet.y)
+    if fleet is not None:
+        ys = fleet.y
+        for i in fleet.live_indices():
+            lead = max(lead, ys[i])
+            tail = min(tail, ys[i])
+    # Stragglers far out of view don't hold the track (keeps the window bounded)
+    tail = max(tail, player_jet.y - VIEW_DISTANCE)
+    track_stream.advance(lead + TRACK_LOOKAHEAD, tail - camera_distance - TRACK_CHUNK_LENGTH)
+    shield_token = track_stream.next_shield(shield_token, player_jet.y - camera_distance)
+
+JET_COLLISION_RADIUS = 80
 
 class Jet:
+    __slots__ = ('x', 'y', 'z', 'prev_x', 'prev_y', 'prev_z', 'velocity_x', 'velocity_y', 'rotation',
+                 'bank_angle', 'speed', 'max_speed', 'acceleration_power', 'braking_power', 'steering_power',
+                 'color', 'is_player', 'finished', 'lap_time', 'race_time', 'crashed', 'crash_cause',
+                 'has_shield')
+
     def __init__(self, position, color, is_player=False):
         self.x, self.y, self.z = position
+        self.prev_x, self.prev_y, self.prev_z = position
         self.velocity_x = 0
         self.velocity_y = 0
         self.rotation = 0 
@@ -120,35 +263,51 @@ class Jet:
         self.lap_time = 0
         self.race_time = 0
         self.crashed = False
+        self.crash_cause = None # "obstacle" or "jet"
         self.has_shield = False
         
     def update(self, dt):
         global coins_collected, game_state
+        self.prev_x, self.prev_y, self.prev_z = self.x, self.y, self.z
+        step = dt * 60
         
         if self.crashed:
             if self.z > 0:
-                self.z -= 2
-                self.rotation += 10
+                self.z -= 2 * step
+                self.rotation += 10 * step
             return
         
         # Stabilization
-        self.velocity_x *= 0.92 
-        self.velocity_y *= AIR_RESISTANCE
+        self.velocity_x *= 0.92 ** step
+        self.velocity_y *= AIR_RESISTANCE ** step
         
         # Banking
         target_bank = -self.velocity_x * 15
-        self.bank_angle += (target_bank - self.bank_angle) * 0.1
+        self.bank_angle += (target_bank - self.bank_angle) * (1 - 0.9 ** step)
         
-        # Position
+        self.fly(dt)
+
+    def fly(self, dt):
+        """Move on the current velocity, then settle height and speed"""
         self.x += self.velocity_x * dt * 60
         self.y += self.velocity_y * dt * 60
-        self.z = 30 + math.sin(time.time() * 5 + self.x) * 2
+        self.z = 30 + math.sin(game_time() * 5 + self.x) * 2
         
         self.speed = math.sqrt(self.velocity_x**2 + self.velocity_y**2)
         
         if self.is_player:
             self.check_collisions()
-        
+        self.keep_on_road()
+
+    def coast(self, dt):
+        """Far AI between decisions: position only, no drag, banking or height (see fleet.py)"""
+        self.prev_x, self.prev_y, self.prev_z = self.x, self.y, self.z
+        self.x += self.velocity_x * dt * 60
+        self.y += self.velocity_y * dt * 60
+        self.keep_on_road()
+
+    def keep_on_road(self):
+        """Walls and the finish line, checked on every tick"""
         # Boundaries
         if abs(self.x) > ROAD_WIDTH / 2 - 50:
             self.velocity_x *= -0.5
@@ -161,61 +320,76 @@ class Jet:
         # Finish logic (Single Lap / Point-to-Point)
         if self.y >= FINISH_LINE_POSITION and not self.finished:
             self.finished = True
-            self.race_time = time.time() - race_start_time
+            self.race_time = game_time() - race_start_time
     
     def check_collisions(self):
         global coins_collected, shield_token, game_state
         
         # 1. Coins
-        for coin in coin_positions:
-            if coin[3]:
-                distance = math.sqrt((self.x - coin[0])**2 + (self.y - coin[1])**2 + (self.z - coin[2])**2)
-                if distance < 60:
-                    coin[3] = False
-                    coins_collected += 1
+        for i in coin_positions.within(self.x, self.y, 60, self.z):
+            coin_positions.kill(i)
+            coins_collected += 1
         
         # 2. Shield
         if shield_token and shield_token[3]:
-            dist = math.sqrt((self.x - shield_token[0])**2 + (self.y - shield_token[1])**2 + (self.z - shield_token[2])**2)
-            if dist < 60:
+            dist_sq = (self.x - shield_token[0])**2 + (self.y - shield_token[1])**2 + (self.z - shield_token[2])**2
+            if dist_sq < 60**2:
                 shield_token[3] = False
                 self.has_shield = True
 
         # 3. OBSTACLES (Player Crash)
-        for obs in obstacles:
-            obs_dist = math.sqrt((self.x - obs[0])**2 + (self.y - obs[1])**2)
-            if obs_dist < 60: # Hitbox
-                if self.has_shield:
-                    self.has_shield = False
-                    obs[1] = -1000 # Remove obstacle effectively
-                else:
-                    self.crashed = True
-                    game_state = FINISHED
+        for i in obstacles.within(self.x, self.y, 60): # Hitbox
+            if self.has_shield:
+                self.has_shield = False
+                impact(obstacles.x[i], obstacles.y[i], obstacles.z[i])
+                obstacles.kill(i)
+                world_changed()
+            else:
+                self.crashed = True
+                self.crash_cause = "obstacle"
+                explode(self.x, self.y, self.z, self.velocity_x, self.velocity_y)
+                game_state = FINISHED
     
-    def accelerate(self):
+    def accelerate(self, dt):
         if not self.crashed and self.speed < self.max_speed:
-            self.velocity_y += self.acceleration_power
+            self.velocity_y += self.acceleration_power * dt * 60
     
-    def brake(self):
+    def brake(self, dt):
         if not self.crashed and self.speed > 0.1:
-            self.velocity_x *= 0.9
-            self.velocity_y *= 0.9
+            self.velocity_x *= 0.9 ** (dt * 60)
+            self.velocity_y *= 0.9 ** (dt * 60)
     
-    def steer_left(self):
+    def steer_left(self, dt):
         if not self.crashed and self.speed > 1:
-            self.velocity_x -= self.steering_power * 0.3
-            self.rotation = max(-25, self.rotation - 2)
+            self.velocity_x -= self.steering_power * 0.3 * dt * 60
+            self.rotation = max(-25, self.rotation - 2 * dt * 60)
     
-    def steer_right(self):
+    def steer_right(self, dt):
         if not self.crashed and self.speed > 1:
-            self.velocity_x += self.steering_power * 0.3
-            self.rotation = min(25, self.rotation + 2)
+            self.velocity_x += self.steering_power * 0.3 * dt * 60
+            self.rotation = min(25, self.rotation + 2 * dt * 60)
     
-    def center_rotation(self):
+    def center_rotation(self, dt):
         if self.rotation > 0:
-            self.rotation = max(0, self.rotation - 1)
+            self.rotation = max(0, self.rotation - dt * 60)
         elif self.rotation < 0:
-            self.rotation = min(0, self.rotation + 1)
+            self.rotation = min(0, self.rotation + dt * 60)
+
+    def render_position(self, alpha):
+        """Position blended between the last two ticks"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha,
+                self.prev_z + (self.z - self.prev_z) * alpha)
+
+    def state(self):
+        """Every attribute as a tuple, in __slots__ order (for world snapshots)"""
+        return jet_state(self)
+
+    def set_state(self, state):
+        for name, value in zip(Jet.__slots__, state):
+            setattr(self, name, value)
+
+jet_state = attrgetter(*Jet.__slots__)
 
 # Game Objects
 player_jet = Jet((0, 0, 30), (0.7, 0.7, 0.8), True) 
@@ -226,6 +400,70 @@ ai_jets = [
 ]
 all_jets = [player_jet] + ai_jets
 
+# Fleet mode: extra AI jets held in arrays (python test.py --fleet 500)
+fleet_size = 0
+fleet = None
+ai_speed_multiplier = 0.0 # Per race, see initialize_race_cars
+ai_ticks = 0
+
+# Autopilot (cheat mode) planner; world_version bumps make it replan
+autopilot = LanePlanner(ROAD_WIDTH)
+world_version = 0 # Bumped when an obstacle is destroyed or a jet crashes
+
+def world_changed():
+    global world_version
+    world_version += 1
+
+# Snapshots: rewind and retry from the race start (not in endless mode, the track stream isn't captured)
+SNAPSHOT_INTERVAL = 30  # Ticks between ring snapshots
+REWIND_SECONDS = 3.0
+snapshots = SnapshotRing(int(10 * SIM_HZ / SNAPSHOT_INTERVAL)) # The last 10 seconds
+race_checkpoint = None  # Taken on the race's first tick
+
+def capture_world():
+    """Everything a race tick reads or changes, enough to carry on exactly from here"""
+    return (tuple(jet.state() for jet in all_jets),
+            fleet.snapshot() if fleet is not None else None,
+            coin_positions.snapshot(), obstacles.snapshot(),
+            shield_token[:] if shield_token else shield_token,
+            bullets.snapshot(), autopilot.snapshot(),
+            coins_collected, sim_clock, race_start_time, game_state, level_cleared, cheat_mode,
+            world_version, ai_ticks, queued_shots, cheat_toggle_queued,
+            input_recorder, input_recorder.ticks if input_recorder is not None else 0)
+
+def restore_world(snapshot):
+    global shield_token, coins_collected, sim_clock, race_start_time, game_state, level_cleared, cheat_mode
+    global world_version, ai_ticks, queued_shots, cheat_toggle_queued, input_recorder
+    (jet_states, fleet_state, coin_state, obstacle_state, shield, bullet_state, planner_state,
+     coins_collected, sim_clock, race_start_time, game_state, level_cleared, cheat_mode,
+     world_version, ai_ticks, queued_shots, cheat_toggle_queued, input_recorder, recorded_ticks) = snapshot
+    for jet, state in zip(all_jets, jet_states):
+        jet.set_state(state)
+    if fleet is not None:
+        fleet.restore(fleet_state)
+    coin_positions.restore(coin_state)
+    obstacles.restore(obstacle_state)
+    shield_token = shield[:] if shield else shield
+    bullets.restore(bullet_state)
+    autopilot.restore(planner_state)
+    if input_recorder is not None:
+        input_recorder.truncate(recorded_ticks) # The recording carries on from here too
+    particles.clear() # Effects of what no longer happened
+
+def rewind_race(seconds):
+    """Back to the newest snapshot at least seconds old"""
+    entry = snapshots.rewind(sim_clock - seconds)
+    if entry is None:
+        retry_race() # Rewound past everything the ring still holds
+    else:
+        restore_world(entry[1])
+
+def retry_race():
+    """Back to the start of the race, without regenerating anything"""
+    if race_checkpoint is not None:
+        snapshots.clear()
+        restore_world(race_checkpoint)
+
 # Input
 keys = {
     b'w': False, b's': False, b'a': False, b'd': False,
@@ -247,32 +485,39 @@ def fire_bullet():
     vx = -math.sin(angle_rad) * bullet_speed
     vy = math.cos(angle_rad) * bullet_speed
     
-    bullets.append([spawn_x, spawn_y, spawn_z, vx, vy])
+    bullets.fire(spawn_x, spawn_y, spawn_z, vx, vy)
 
 def update_bullets(dt):
-    global bullets, obstacles
-    active_bullets = []
-    for b in bullets:
-        b[0] += b[3] * dt
-        b[1] += b[4] * dt
-        bullet_hit = False
-        
-        # Check collision with Obstacles
-        for obs in obstacles:
-            dist = math.sqrt((b[0] - obs[0])**2 + (b[1] - obs[1])**2)
-            if dist < 35:
-                bullet_hit = True
-                obs[1] = -5000 
-                break
-        
-        if not bullet_hit and 0 < b[1] < ROAD_LENGTH + 500:
-            active_bullets.append(b)
-            
-    bullets = active_bullets
+    # Endless: past the generated track there is nothing left to hit
+    y_max = player_jet.y + TRACK_LOOKAHEAD if endless_mode else ROAD_LENGTH + 500
+    x_max = ROAD_WIDTH / 2 + 50 # Off the road there is nothing to hit either
+    for i in bullets.update(dt, obstacles, y_max, x_max): # Swept, so nothing is skipped between ticks
+        impact(obstacles.x[i], obstacles.y[i], obstacles.z[i])
+        world_changed()
+
+def explode(x, y, z, velocity_x, velocity_y):
+    """Fireball, sparks and smoke where a jet went down"""
+    if abs(y - player_jet.y) > VIEW_DISTANCE:
+        return # Nobody is there to see it
+    now = game_time()
+    vx, vy = velocity_x * 30, velocity_y * 30 # Debris keeps half the jet's speed (per frame -> per s)
+    particles.burst(now, x, y, z, 400, 90, (1.0, 0.5, 0.1), 0.9, vx=vx, vy=vy)
+    particles.burst(now, x, y, z, 150, 160, (1.0, 0.9, 0.3), 0.5, gravity=-400, vx=vx, vy=vy)
+    particles.burst(now, x, y, z, 200, 40, (0.3, 0.3, 0.3), 2.0, gravity=30)
+
+def impact(x, y, z):
+    """Sparks and a flash where an obstacle is shot or rammed"""
+    if abs(y - player_jet.y) > VIEW_DISTANCE:
+        return
+    now = game_time()
+    particles.burst(now, x, y, z, 120, 150, (1.0, 1.0, 0.4), 0.4, gravity=-500)
+    particles.burst(now, x, y, z, 80, 60, (1.0, 0.3, 0.0), 0.7)
 
 # ------------------------------
 
-def draw_text_2d(x, y, text, size=18):
+def begin_text_batch():
+    """Set up the 2D text state once; draw_text_2d then only places glyphs until end_text_batch"""
+    global text_batch_active
     glPushAttrib(GL_ALL_ATTRIB_BITS)
     glDisable(GL_DEPTH_TEST)
     glDisable(GL_LIGHTING)
@@ -288,8 +533,31 @@ def draw_text_2d(x, y, text, size=18):
         glColor3f(0.0, 1.0, 1.0) 
     else:
         glColor3f(0.0, 1.0, 0.0) 
-        
+    text_batch_active = True
+
+def end_text_batch():
+    global text_batch_active
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    glPopAttrib()
+    text_batch_active = False
+
+def draw_text_2d(x, y, text, size=18, cached=False):
+    """Draw text at window coords; cached=True replays a prebuilt glyph run (static strings)"""
+    if not text_batch_active:
+        begin_text_batch()
+        draw_text_2d(x, y, text, size, cached)
+        end_text_batch()
+        return
     glRasterPos2f(x, y)
+    if cached:
+        glCallList(get_text_run(text, size))
+    else:
+        emit_glyphs(text, size)
+
+def emit_glyphs(text, size):
     try:
         font = GLUT_BITMAP_HELVETICA_18 if size == 18 else GLUT_BITMAP_HELVETICA_12
         for char in text:
@@ -297,76 +565,191 @@ def draw_text_2d(x, y, text, size=18):
     except:
         for char in text:
             glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
-    glPopMatrix()
-    glMatrixMode(GL_PROJECTION)
-    glPopMatrix()
-    glMatrixMode(GL_MODELVIEW)
-    glPopAttrib()
+
+def get_text_run(text, size):
+    """Display list with the glyphs of a static string"""
+    run = text_run_lists.get((text, size))
+    if run is None:
+        run = gl_resources.new_list(SESSION, "text", len(text)) # A glyph costs about a vertex
+        glNewList(run, GL_COMPILE)
+        emit_glyphs(text, size)
+        glEndList()
+        text_run_lists[(text, size)] = run
+    return run
 
 def draw_game_objects():
-    # Draw Coins
-    for coin in coin_positions:
-        if coin[3]:
-            glPushMatrix()
-            glTranslatef(coin[0], coin[1], coin[2])
-            glRotatef(time.time() * 100, 0, 0, 1)
-            glRotatef(90, 1, 0, 0)
-            if cyberpunk_mode:
-                glColor3f(1.0, 0.0, 1.0) 
-            else:
-                glColor3f(0.0, 1.0, 0.0) 
-            glutSolidTorus(2, 8, 8, 16)
-            glPopMatrix()
+    # Only the y-window the camera can see is visited; the rest counts as culled
+    view_y_min, view_y_max = view_culler.y_range()
 
-    # Draw Shield Token
-    if shield_token and shield_token[3]:
+    # Draw Coins
+    cx, cy, cz = coin_positions.x, coin_positions.y, coin_positions.z
+    in_window = coin_positions.indices(view_y_min, view_y_max)
+    view_culler.culled += len(coin_positions) - len(in_window)
+    coin_color = (1.0, 0.0, 1.0) if cyberpunk_mode else (0.0, 1.0, 0.0)
+    spin = time.time() * 100
+    for i in in_window:
+        if not view_culler.visible(cx[i], cy[i], cz[i], 10):
+            continue
+        detail = lod.level((cx[i], cy[i]), cx[i], cy[i])
+        if detail == IMPOSTOR:
+            lod.add_impostor(coin_color, cx[i], cy[i], cz[i])
+            continue
         glPushMatrix()
-        glTranslatef(shield_token[0], shield_token[1], shield_token[2])
-        glRotatef(time.time() * 50, 0, 1, 0) 
-        glColor3f(0.0, 0.0, 1.0) # Blue Sphere
-        glutSolidSphere(8, 16, 16)
+        glTranslatef(cx[i], cy[i], cz[i])
+        glRotatef(spin, 0, 0, 1)
+        glRotatef(90, 1, 0, 0)
+        glColor3f(*coin_color)
+        glutSolidTorus(2, 8, segments(8, detail), segments(16, detail))
         glPopMatrix()
 
-    # Draw Obstacles (Only if they are on the map)
-    for obs in obstacles:
-        if obs[1] > -100: # Don't draw destroyed ones
+    # Draw Shield Token
+    if shield_token and shield_token[3] and view_culler.visible(*shield_token[:3], 10):
+        detail = lod.level("shield", shield_token[0], shield_token[1])
+        if detail == IMPOSTOR:
+            lod.add_impostor((0.0, 0.0, 1.0), shield_token[0], shield_token[1], shield_token[2])
+        else:
             glPushMatrix()
-            glTranslatef(obs[0], obs[1], obs[2])
-            
-            glColor3f(1.0, 0.0, 0.0) # Red
-            
-            if obs[3] == 0: # CUBE
-                glutSolidCube(40)
-            else: # CONE
-                glRotatef(-90, 1, 0, 0)
-                glutSolidCone(20, 60, 16, 16)
-                
+            glTranslatef(shield_token[0], shield_token[1], shield_token[2])
+            glRotatef(time.time() * 50, 0, 1, 0) 
+            glColor3f(0.0, 0.0, 1.0) # Blue Sphere
+            glutSolidSphere(8, segments(16, detail), segments(16, detail))
             glPopMatrix()
-            
-    # Draw Bullets
-    for b in bullets:
+
+    # Draw Obstacles (destroyed ones are dead in the store)
+    ox, oy, oz = obstacles.x, obstacles.y, obstacles.z
+    in_window = obstacles.indices(view_y_min, view_y_max)
+    view_culler.culled += len(obstacles) - len(in_window)
+    for i in in_window:
+        if not view_culler.visible(ox[i], oy[i], oz[i], 60):
+            continue
+        detail = lod.level((ox[i], oy[i]), ox[i], oy[i])
+        if detail == IMPOSTOR:
+            lod.add_impostor((1.0, 0.0, 0.0), ox[i], oy[i], oz[i])
+            continue
         glPushMatrix()
-        glTranslatef(b[0], b[1], b[2])
+        glTranslatef(ox[i], oy[i], oz[i])
+        
+        glColor3f(1.0, 0.0, 0.0) # Red
+        
+        if obstacles.kind[i] == 0: # CUBE
+            glutSolidCube(40)
+        else: # CONE
+            glRotatef(-90, 1, 0, 0)
+            glutSolidCone(20, 60, segments(16, detail), segments(16, detail))
+            
+        glPopMatrix()
+            
+    # Draw Bullets: the whole pool as one batch of points (minigun bursts run into thousands),
+    # placed where they were at render_alpha
+    if bullets.place(bullets.time + (render_alpha - 1) * SIM_DT):
+        glDisable(GL_LIGHTING)
+        glPointSize(BULLET_POINT_SIZE)
         glColor3f(1.0, 1.0, 0.0) # Yellow
-        glutSolidSphere(3, 8, 8)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, bullets.vertices)
+        glDrawArrays(GL_POINTS, 0, bullets.count)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glEnable(GL_LIGHTING)
+
+def draw_particles():
+    """Particle bursts and exhaust plumes: GL_POINTS slices of one vertex array (see particles.py)"""
+    if not particles.live and not exhaust_nozzles:
+        return
+    glDisable(GL_LIGHTING)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glDepthMask(GL_FALSE) # See-through, so they don't hide each other
+    glPointSize(PARTICLE_POINT_SIZE)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, particles.vertices)
+
+    y_min, y_max = view_culler.y_range()
+    for first, count, x, y, z, scale, r, g, b, alpha in particles.draws(game_time(), y_min, y_max):
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        glScalef(scale, scale, scale)
+        glColor4f(r, g, b, alpha)
+        glDrawArrays(GL_POINTS, first, count)
         glPopMatrix()
 
+    if exhaust_nozzles:
+        # Every jet's plume in one batch, already in world space
+        if cyberpunk_mode:
+            glColor4f(1.0, 0.0, 1.0, 0.8)
+        else:
+            glColor4f(0.0, 1.0, 0.0, 0.8)
+        glVertexPointer(3, GL_FLOAT, 0, particles.plume_vertices)
+        glDrawArrays(GL_POINTS, 0, particles.place_plumes(exhaust_nozzles))
+        exhaust_nozzles.clear()
+
+    glDisableClientState(GL_VERTEX_ARRAY)
+    glDepthMask(GL_TRUE)
+    glDisable(GL_BLEND)
+    glEnable(GL_LIGHTING)
+
+def draw_impostors():
+    """Everything lod turned into a point this frame, in one GL_POINTS batch"""
+    if not lod.impostors:
+        return
+    glDisable(GL_LIGHTING)
+    glPointSize(IMPOSTOR_POINT_SIZE)
+    glBegin(GL_POINTS)
+    for color, points in lod.impostors.items():
+        glColor3f(*color)
+        for k in range(0, len(points), 3):
+            glVertex3f(points[k], points[k + 1], points[k + 2])
+    glEnd()
+    glEnable(GL_LIGHTING)
+
 def draw_highway_road():
+    """Replay the compiled road chunks in view, then the dynamic objects"""
+    if track_geometry_dirty:
+        build_track_geometry()
+    y_min, y_max = view_culler.y_range()
+    first = max(0, int(y_min // TRACK_CHUNK_LENGTH))
+    if endless_mode:
+        release_road_chunks(int(track_stream.evicted_to // TRACK_CHUNK_LENGTH))
+    for n in range(first, int(y_max // TRACK_CHUNK_LENGTH) + 1):
+        chunk_list = track_chunk_lists.get(n)
+        if chunk_list is None and endless_mode:
+            chunk_list = track_chunk_lists[n] = compile_road_chunk(n)
+        if chunk_list is not None:
+            glCallList(chunk_list)
+    draw_game_objects()
+
+def compile_road_chunk(n):
+    y_start = n * TRACK_CHUNK_LENGTH
+    y_end = min(y_start + TRACK_CHUNK_LENGTH, ROAD_LENGTH)
+    # Surface, two edge lights every 100 units, a dash every 160
+    vertices = 4 + (y_end - y_start) // 100 * 2 * sphere_vertices(8, 8) + (y_end - y_start) // 160 * 4
+    chunk_list = gl_resources.new_list(LEVEL, "road chunk", int(vertices))
+    glNewList(chunk_list, GL_COMPILE)
+    emit_road_chunk(y_start, y_end)
+    glEndList()
+    return chunk_list
+
+def release_road_chunks(below):
+    """Endless mode: free the lists of chunks the track stream has evicted"""
+    for n in [n for n in track_chunk_lists if n < below]:
+        gl_resources.delete_list(track_chunk_lists.pop(n))
+
+def emit_road_chunk(y_start, y_end):
+    """Immediate-mode road surface, edge lights and center dashes for [y_start, y_end)"""
     if cyberpunk_mode:
         glColor3f(0.1, 0.0, 0.2) 
     else:
         glColor3f(0.0, 0.0, 0.0)
     
     glBegin(GL_QUADS)
-    glVertex3f(-ROAD_WIDTH/2, 0, 0)
-    glVertex3f(ROAD_WIDTH/2, 0, 0)
-    glVertex3f(ROAD_WIDTH/2, ROAD_LENGTH, 0)
-    glVertex3f(-ROAD_WIDTH/2, ROAD_LENGTH, 0)
+    glVertex3f(-ROAD_WIDTH/2, y_start, 0)
+    glVertex3f(ROAD_WIDTH/2, y_start, 0)
+    glVertex3f(ROAD_WIDTH/2, y_end, 0)
+    glVertex3f(-ROAD_WIDTH/2, y_end, 0)
     glEnd()
     
     light_spacing = 100
-    y = 0
-    while y < ROAD_LENGTH:
+    y = math.ceil(y_start / light_spacing) * light_spacing
+    while y < y_end:
         if cyberpunk_mode:
             glColor3f(0, 1, 1) 
         else:
@@ -391,8 +774,8 @@ def draw_highway_road():
     glLineWidth(5)
     dash_length = 80
     gap_length = 80
-    y_pos = 0
-    while y_pos < ROAD_LENGTH:
+    y_pos = math.ceil(y_start / (dash_length + gap_length)) * (dash_length + gap_length)
+    while y_pos < y_end:
         glBegin(GL_QUADS)
         glVertex3f(-5, y_pos, 1)
         glVertex3f(5, y_pos, 1)
@@ -400,9 +783,46 @@ def draw_highway_road():
         glVertex3f(-5, min(y_pos + dash_length, ROAD_LENGTH), 1)
         glEnd()
         y_pos += dash_length + gap_length
-    
-    draw_game_objects()
-    draw_finish_line()
+
+def release_level_resources():
+    """Free the GL objects of the current track; the next frame rebuilds them"""
+    global track_chunk_lists, scenery_list, track_geometry_dirty
+    gl_resources.release(LEVEL)
+    track_chunk_lists = {}
+    scenery_list = None
+    track_geometry_dirty = True
+
+def build_track_geometry():
+    """Compile the static scenery into display lists (once per level / theme)"""
+    global track_chunk_lists, scenery_list, track_geometry_dirty
+    release_level_resources()
+    if not endless_mode: # Endless chunks are compiled as they come into view
+        for n in range(math.ceil(ROAD_LENGTH / TRACK_CHUNK_LENGTH)):
+            track_chunk_lists[n] = compile_road_chunk(n)
+
+    # Ground, finish posts, banner and checkers
+    scenery_list = gl_resources.new_list(LEVEL, "scenery", 4 + 2 * sphere_vertices(10, 1) + 20)
+    glNewList(scenery_list, GL_COMPILE)
+    if endless_mode:
+        draw_highway_environment(ENDLESS_GROUND_LENGTH)
+    else:
+        draw_highway_environment(ROAD_LENGTH + 1000)
+        draw_finish_line()
+    glEndList()
+    track_geometry_dirty = False
+
+def draw_track_scenery():
+    """Ground plane and finish line from their compiled list"""
+    if track_geometry_dirty:
+        build_track_geometry()
+    if endless_mode:
+        # A view-sized slab of ground that follows the camera
+        glPushMatrix()
+        glTranslatef(0, (view_culler.eye_y // TRACK_CHUNK_LENGTH - 1) * TRACK_CHUNK_LENGTH, 0)
+        glCallList(scenery_list)
+        glPopMatrix()
+    else:
+        glCallList(scenery_list)
 
 def draw_finish_line():
     finish_y = FINISH_LINE_POSITION
@@ -416,7 +836,7 @@ def draw_finish_line():
         glPushMatrix()
         glTranslatef(x, finish_y, 0)
         glRotatef(-90, 1, 0, 0)
-        gluCylinder(gluNewQuadric(), 5, 5, 80, 10, 1)
+        gluCylinder(gl_resources.quadric(), 5, 5, 80, 10, 1)
         glPopMatrix()
     
     if cyberpunk_mode:
@@ -444,7 +864,7 @@ def draw_finish_line():
             glVertex3f(x1, finish_y + 100, 1)
             glEnd()
 
-def draw_highway_environment():
+def draw_highway_environment(length):
     if cyberpunk_mode:
         glColor3f(0.1, 0.0, 0.2)
     else:
@@ -453,13 +873,20 @@ def draw_highway_environment():
     glBegin(GL_QUADS)
     glVertex3f(-3000, 0, -5)
     glVertex3f(3000, 0, -5)
-    glVertex3f(3000, ROAD_LENGTH + 1000, -5)
-    glVertex3f(-3000, ROAD_LENGTH + 1000, -5)
+    glVertex3f(3000, length, -5)
+    glVertex3f(-3000, length, -5)
     glEnd()
 
-def draw_fighter_jet(jet):
+def draw_fighter_jet(jet, lod_key=None):
+    """lod_key identifies the jet across frames (defaults to the object itself)"""
+    x, y, z = jet.render_position(render_alpha)
+    detail = lod.level(id(jet) if lod_key is None else lod_key, x, y)
+    if detail == IMPOSTOR:
+        lod.add_impostor((0.3, 0.3, 0.3) if jet.crashed else jet.color, x, y, z)
+        return
+
     glPushMatrix()
-    glTranslatef(jet.x, jet.y, jet.z)
+    glTranslatef(x, y, z)
     
     # Shield Effect
     if jet.has_shield:
@@ -467,38 +894,70 @@ def draw_fighter_jet(jet):
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE) 
         glColor4f(0.0, 0.0, 1.0, 0.3) 
-        glutSolidSphere(22, 24, 24) 
+        glutSolidSphere(22, segments(24, detail), segments(24, detail)) 
         glDisable(GL_BLEND)
         glPopMatrix()
     
     glRotatef(jet.rotation, 0, 0, 1)
     glRotatef(jet.bank_angle, 0, 1, 0)
+    glCallList(get_jet_mesh(jet.color, jet.crashed, jet.is_player, detail))
     
-    if jet.crashed:
+    # Exhaust is the only part that changes frame to frame (too small to see past FULL);
+    # it's drawn with the particles
+    if not jet.crashed and jet.speed > 0.5 and detail == FULL:
+        exhaust_nozzles.append((x, y, z, jet.rotation, jet.bank_angle, 1.0 + fx_rng.uniform(-0.2, 0.2)))
+
+    glPopMatrix()
+
+def get_jet_mesh(color, crashed, is_player, detail=FULL):
+    """Display list for a jet body, compiled once per look (color/crashed/player/lod) and theme"""
+    key = (color, crashed, is_player, detail)
+    mesh = jet_meshes.get(key)
+    if mesh is None:
+        mesh = gl_resources.new_list(THEME, "jet mesh", jet_body_vertices(is_player, detail))
+        glNewList(mesh, GL_COMPILE)
+        emit_jet_body(color, crashed, is_player, detail)
+        glEndList()
+        jet_meshes[key] = mesh
+    return mesh
+
+def jet_body_vertices(is_player, detail):
+    """Rough vertex count of emit_jet_body, for gl_resources"""
+    def s(n):
+        return segments(n, detail)
+    vertices = (sphere_vertices(s(12), s(12)) + cone_vertices(s(10), 2) + sphere_vertices(s(8), s(8))
+                + 2 * sphere_vertices(s(6), s(6)) + 9)
+    if is_player:
+        vertices += sphere_vertices(s(10), s(10)) + cone_vertices(s(10), 2)
+    return vertices
+
+def emit_jet_body(color, crashed, is_player, detail=FULL):
+    """Immediate-mode jet in model space (fuselage, nose, gun, canopy, wings, engines)"""
+    if crashed:
         glColor3f(0.3, 0.3, 0.3)
     else:
-        glColor3f(jet.color[0], jet.color[1], jet.color[2])
+        glColor3f(color[0], color[1], color[2])
     
     glPushMatrix()
     glScalef(1.5, 5.0, 1.5) 
-    glutSolidSphere(4, 12, 12)
+    glutSolidSphere(4, segments(12, detail), segments(12, detail))
     glPopMatrix()
     
     glPushMatrix()
     glTranslatef(0, 18, 0)
     glRotatef(-90, 1, 0, 0) 
     glColor3f(0.2, 0.2, 0.2) 
-    glutSolidCone(3.5, 8, 10, 2)
+    glutSolidCone(3.5, 8, segments(10, detail), 2)
     glPopMatrix()
     
     # GUN (Player Only)
-    if jet.is_player:
+    if is_player:
         glPushMatrix()
         glTranslatef(0, 12, 7.0)
         glColor3f(0.2, 0.2, 0.2)
-        glutSolidSphere(2.5, 10, 10)
+        glutSolidSphere(2.5, segments(10, detail), segments(10, detail))
         glRotatef(-90, 1, 0, 0) 
-        glutSolidCone(1.5, 35, 10, 2)
+        glutSolidCone(1.5, 35, segments(10, detail), 2)
         glPopMatrix()
 
     glPushMatrix()
@@ -510,11 +969,11 @@ def draw_fighter_jet(jet):
     else:
         glColor3f(0.0, 1.0, 0.0) 
         
-    glutSolidSphere(2, 8, 8)
+    glutSolidSphere(2, segments(8, detail), segments(8, detail))
     glPopMatrix()
     
-    if not jet.crashed:
-        glColor3f(jet.color[0]*0.9, jet.color[1]*0.9, jet.color[2]*0.9)
+    if not crashed:
+        glColor3f(color[0]*0.9, color[1]*0.9, color[2]*0.9)
     
     glBegin(GL_TRIANGLES)
     glVertex3f(-3.5, 8, 0)    
@@ -533,100 +992,128 @@ def draw_fighter_jet(jet):
     glColor3f(0.2, 0.2, 0.2)
     glPushMatrix()
     glTranslatef(-2.5, 0, 0)
-    glutSolidSphere(2.0, 6, 6)
+    glutSolidSphere(2.0, segments(6, detail), segments(6, detail))
     glPopMatrix()
     glPushMatrix()
     glTranslatef(2.5, 0, 0)
-    glutSolidSphere(2.0, 6, 6)
+    glutSolidSphere(2.0, segments(6, detail), segments(6, detail))
     glPopMatrix()
-    
-    if not jet.crashed and jet.speed > 0.5:
-        pulse = 1.0 + random.uniform(-0.2, 0.2)
-        if cyberpunk_mode:
-            glColor3f(1.0, 0.0, 1.0) 
-        else:
-            glColor3f(0.0, 1.0, 0.0) 
-
-        glPushMatrix()
-        glTranslatef(-2.5, -3, 0)
-        glScalef(1.5, pulse * 4, 1.5)
-        glutSolidSphere(1.0, 6, 6)
-        glPopMatrix()
-        glPushMatrix()
-        glTranslatef(2.5, -3, 0)
-        glScalef(1.5, pulse * 4, 1.5)
-        glutSolidSphere(1.0, 6, 6)
-        glPopMatrix()
-
-    glPopMatrix() 
     glPopMatrix()
 
+def draw_fleet():
+    """Draw the fleet jets inside the view"""
+    if fleet is None:
+        return
+    view_y_min, view_y_max = view_culler.y_range()
+    view = None
+    for i in range(len(fleet)):
+        if not view_y_min < fleet.y[i] < view_y_max:
+            view_culler.culled += 1
+        elif view_culler.visible(fleet.x[i], fleet.y[i], fleet.z[i], 30):
+            view = fleet.view(i, view)
+            draw_fighter_jet(view, ("fleet", i))
+
 def update_ai_racers(dt):
-    """AI with SCALABLE speed based on level"""
+    """AI with SCALABLE speed based on level. Jets within NEAR_RANGE of the
+    player decide every tick; farther ones every FAR_INTERVAL ticks (see fleet.py)."""
+    global ai_ticks
+    step = dt * 60
+    steer_zone = ROAD_WIDTH / 3
+    tick_phase = int(game_time() * 2)
+    far_phase = ai_ticks % FAR_INTERVAL
+    far_stabilize, far_drag, far_gain, far_push, far_bank_follow = far_rates(step, AIR_RESISTANCE)
+    ai_ticks += 1
+
     for i, jet in enumerate(ai_jets):
         if jet.finished or jet.crashed:
             continue
-        
-        # --- MODIFIED SPEED LOGIC ---
-        # Base difficulty + (Level * 0.15)
-        # This gives a 15% speed boost per level
-        difficulty_multiplier = 0.10 + (custom_difficulty * 0.01)
-        ai_speed_multiplier = difficulty_multiplier + ((current_level - 1) * 0.15)
-        
+
+        if abs(jet.y - player_jet.y) >= NEAR_RANGE:
+            if i % FAR_INTERVAL != far_phase:
+                jet.coast(dt)
+                continue
+            # The steering below, FAR_INTERVAL ticks at a time as JetFleet does
+            # it (the player is never within 200 here)
+            push = 0.0
+            if (tick_phase + i) % 20 == 0 and abs(jet.x) < steer_zone:
+                push = 0.05 if jet.x < 0 else -0.05
+            if abs(jet.x) > steer_zone:
+                push -= jet.x * 0.05
+            jet.prev_x, jet.prev_y, jet.prev_z = jet.x, jet.y, jet.z
+            jet.velocity_x = jet.velocity_x * far_stabilize + push * far_push
+            jet.velocity_y = far_velocity_y(jet.velocity_y, jet.velocity_x, jet.speed, jet.max_speed, far_drag,
+                                            jet.acceleration_power * ai_speed_multiplier * far_gain)
+            jet.bank_angle += (-jet.velocity_x * 15 - jet.bank_angle) * far_bank_follow
+            jet.fly(dt)
+            continue
+
         if jet.speed < jet.max_speed:
-            jet.velocity_y += jet.acceleration_power * ai_speed_multiplier
-        
-        current_time = time.time()
+            jet.velocity_y += jet.acceleration_power * ai_speed_multiplier * step
         
         if abs(jet.y - player_jet.y) < 200:
             if abs(jet.x - player_jet.x) < 120:
                 if jet.x > player_jet.x:
-                    jet.velocity_x += 0.3 
+                    jet.velocity_x += 0.3 * step
                 else:
-                    jet.velocity_x -= 0.3 
+                    jet.velocity_x -= 0.3 * step
         
-        elif int(current_time * 2 + i) % 20 == 0: 
-            if abs(jet.x) < ROAD_WIDTH/3:
+        elif (tick_phase + i) % 20 == 0: 
+            if abs(jet.x) < steer_zone:
                 steer_direction = 1 if jet.x < 0 else -1
-                jet.velocity_x += steer_direction * 0.05 
+                jet.velocity_x += steer_direction * 0.05 * step
         
-        if abs(jet.x) > ROAD_WIDTH/3:
-            jet.velocity_x -= jet.x * 0.05 
+        if abs(jet.x) > steer_zone:
+            jet.velocity_x -= jet.x * 0.05 * step
         
         jet.update(dt)
 
+    if fleet is not None:
+        fleet.update(dt, game_time(), player_jet.x, player_jet.y, ai_speed_multiplier,
+                     AIR_RESISTANCE, FINISH_LINE_POSITION, race_start_time)
+
+def get_ai_speed_multiplier():
+    # --- MODIFIED SPEED LOGIC ---
+    # Base difficulty + (Level * 0.15)
+    # This gives a 15% speed boost per level
+    difficulty_multiplier = 0.10 + (custom_difficulty * 0.01)
+    return difficulty_multiplier + ((current_level - 1) * 0.15)
+
 def update_highway_camera():
     if game_state == RACING:
+        jet_x, jet_y, jet_z = player_jet.render_position(render_alpha)
         if first_person_view:
             glMatrixMode(GL_PROJECTION)
             glLoadIdentity()
-            gluPerspective(70, WINDOW_WIDTH/WINDOW_HEIGHT, 1, 5000)
+            gluPerspective(70, WINDOW_WIDTH/WINDOW_HEIGHT, 1, VIEW_DISTANCE)
             glMatrixMode(GL_MODELVIEW)
             glLoadIdentity()
             forward_x = math.sin(math.radians(player_jet.rotation)) * -1 
             forward_y = math.cos(math.radians(player_jet.rotation))
-            gluLookAt(player_jet.x, player_jet.y + 10, player_jet.z + 5,
-                      player_jet.x + forward_x * 100, player_jet.y + 100, player_jet.z,
+            gluLookAt(jet_x, jet_y + 10, jet_z + 5,
+                      jet_x + forward_x * 100, jet_y + 100, jet_z,
                       0, 0, 1)
+            view_culler.set_camera(jet_x, jet_y + 10, jet_z + 5,
+                                   jet_x + forward_x * 100, jet_y + 100, jet_z, 70)
         else:
-            target_x = player_jet.x * 0.8 
-            target_y = player_jet.y - camera_distance
-            target_z = player_jet.z + camera_height
+            target_x = jet_x * 0.8 
+            target_y = jet_y - camera_distance
+            target_z = jet_z + camera_height
             glMatrixMode(GL_PROJECTION)
             glLoadIdentity()
-            gluPerspective(60, WINDOW_WIDTH/WINDOW_HEIGHT, 1, 5000)
+            gluPerspective(60, WINDOW_WIDTH/WINDOW_HEIGHT, 1, VIEW_DISTANCE)
             glMatrixMode(GL_MODELVIEW)
             glLoadIdentity()
             gluLookAt(target_x, target_y, target_z,
-                      player_jet.x, player_jet.y + 100, player_jet.z,
+                      jet_x, jet_y + 100, jet_z,
                       0, 0, 1)
+            view_culler.set_camera(target_x, target_y, target_z, jet_x, jet_y + 100, jet_z, 60)
 
 def draw_dashboard_hud():
     if game_state != RACING and game_state != PAUSED:
         return
     
     if player_jet.crashed:
-        draw_text_2d(WINDOW_WIDTH//2 - 50, WINDOW_HEIGHT//2, "CRASHED!")
+        draw_text_2d(WINDOW_WIDTH//2 - 50, WINDOW_HEIGHT//2, "CRASHED!", cached=True)
         return
     
     speed_knots = int(player_jet.speed * 20)
@@ -642,30 +1129,55 @@ def draw_dashboard_hud():
     if cheat_mode:
         # Blinking effect for autopilot text
         if int(time.time() * 2) % 2 == 0:
-             draw_text_2d(20, WINDOW_HEIGHT - 280, "AUTOPILOT ENGAGED")
+             draw_text_2d(20, WINDOW_HEIGHT - 280, "AUTOPILOT ENGAGED", cached=True)
     # ----------------------------
 
+    if minigun_mode:
+        draw_text_2d(20, WINDOW_HEIGHT - 310, f"MINIGUN  Rounds in flight: {len(bullets)}")
+
     theme_text = "CYBERPUNK" if cyberpunk_mode else "STANDARD"
     draw_text_2d(20, WINDOW_HEIGHT - 160, f"Theme: {theme_text}")
     
-    distance_remaining = max(0, FINISH_LINE_POSITION - player_jet.y)
-    draw_text_2d(20, WINDOW_HEIGHT - 190, f"Distance: {int(distance_remaining)}m")
+    if endless_mode:
+        draw_text_2d(20, WINDOW_HEIGHT - 190, f"Distance: {int(player_jet.y)}m")
+    else:
+        distance_remaining = max(0, FINISH_LINE_POSITION - player_jet.y)
+        draw_text_2d(20, WINDOW_HEIGHT - 190, f"Distance: {int(distance_remaining)}m")
     
-    if race_start_time > 0:
-        current_race_time = time.time() - race_start_time
-        draw_text_2d(20, WINDOW_HEIGHT - 220, f"Time: {current_race_time:.1f}s")
+    current_race_time = game_time() - race_start_time
+    draw_text_2d(20, WINDOW_HEIGHT - 220, f"Time: {current_race_time:.1f}s")
     
     position = 1
     for jet in ai_jets:
         if jet.y > player_jet.y and not jet.crashed:
             position += 1
-    draw_text_2d(20, WINDOW_HEIGHT - 250, f"Rank: {position}/4")
-    draw_text_2d(WINDOW_WIDTH - 250, WINDOW_HEIGHT - 30, "JET RACER 3D")
-    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 60, "W/S: Throttle")
-    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 80, "A/D: Bank Left/Right")
-    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 100, "M: Switch Theme")
-    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 120, "V: Camera | Click: Shoot")
-    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 140, "C: Toggle Auto-Pilot")
+    field_size = len(all_jets)
+    if fleet is not None:
+        position += fleet.count_ahead(player_jet.y)
+        field_size += len(fleet)
+    draw_text_2d(20, WINDOW_HEIGHT - 250, f"Rank: {position}/{field_size}")
+    draw_text_2d(WINDOW_WIDTH - 250, WINDOW_HEIGHT - 30, "JET RACER 3D", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 60, "W/S: Throttle", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 80, "A/D: Bank Left/Right", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 100, "M: Switch Theme", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 120, "V: Camera | Click: Shoot", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 140, "C: Toggle Auto-Pilot", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 160, "F: Frame Profiler", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 180, "G: Minigun (hold Click)", cached=True)
+    draw_text_2d(WINDOW_WIDTH - 300, WINDOW_HEIGHT - 200, "Z: Rewind 3s | X: Retry", cached=True)
+    draw_text_2d(20, 20, f"Drawn: {view_culler.drawn}  Culled: {view_culler.culled}", 12)
+
+def draw_profiler_overlay():
+    """p50/p99 per phase over the last profiler.capacity frames"""
+    y = WINDOW_HEIGHT - 225
+    draw_text_2d(WINDOW_WIDTH - 300, y, f"FPS: {profiler.fps():.0f}   p50 / p99 ms", 12)
+    for phase, p50, p99 in profiler.summary():
+        y -= 16
+        draw_text_2d(WINDOW_WIDTH - 300, y, f"{phase:>8}: {p50:6.2f} / {p99:6.2f}", 12)
+    full, reduced, points = lod.counts
+    draw_text_2d(WINDOW_WIDTH - 300, y - 16, f"     lod: {full} / {reduced} / {points} pts", 12)
+    draw_text_2d(WINDOW_WIDTH - 300, y - 32,
+                 f"      gl: {gl_resources.live()} objects, {gl_resources.estimated_bytes() / 1024:.0f} KB", 12)
 
 def draw_main_menu():
     if cyberpunk_mode:
@@ -673,6 +1185,7 @@ def draw_main_menu():
     else:
         glClearColor(0.0, 0.0, 0.0, 1) # Pure Black
         
+    begin_text_batch()
     draw_text_2d(WINDOW_WIDTH//2 - 90, WINDOW_HEIGHT//2 + 200, "JET RACER 3D")
     draw_text_2d(WINDOW_WIDTH//2 - 150, WINDOW_HEIGHT//2 + 170, "==========================")
     draw_text_2d(WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 + 120, "Combat Edition")
@@ -688,6 +1201,7 @@ def draw_main_menu():
     
     draw_text_2d(WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 - 70, "ESC to Abort")
     draw_text_2d(WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 - 110, "Press M to Toggle Theme")
+    end_text_batch()
 
 def draw_custom_race_menu():
     if cyberpunk_mode:
@@ -695,6 +1209,7 @@ def draw_custom_race_menu():
     else:
         glClearColor(0.05, 0.05, 0.05, 1)
         
+    begin_text_batch()
     draw_text_2d(WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 + 150, "CUSTOM SORTIE")
     draw_text_2d(WINDOW_WIDTH//2 - 130, WINDOW_HEIGHT//2 + 120, "==========================")
     
@@ -710,6 +1225,7 @@ def draw_custom_race_menu():
     
     draw_text_2d(WINDOW_WIDTH//2 - 80, WINDOW_HEIGHT//2 - 100, "Press SPACE to Launch")
     draw_text_2d(WINDOW_WIDTH//2 - 80, WINDOW_HEIGHT//2 - 120, "Press ESC to return")
+    end_text_batch()
 
 def draw_game_complete():
     if cyberpunk_mode:
@@ -719,6 +1235,7 @@ def draw_game_complete():
         
     center_x = WINDOW_WIDTH // 2
     center_y = WINDOW_HEIGHT // 2
+    begin_text_batch()
     draw_text_2d(center_x - 120, center_y + 150, "MISSION ACCOMPLISHED!", 18)
     draw_text_2d(center_x - 90, center_y + 120, "CAMPAIGN FINISHED!", 18)
     draw_text_2d(center_x - 150, center_y + 90, f"YOU COMPLETED ALL {max_level} ZONES!", 18)
@@ -731,72 +1248,75 @@ def draw_game_complete():
     else:
         draw_text_2d(center_x - 100, center_y - 60, "Thanks for Playing!", 18)
         draw_text_2d(center_x - 130, center_y - 90, "Press ESC to return to base", 18)
+    end_text_batch()
 
 def handle_highway_controls(dt):
     global first_person_view
     if game_state != RACING:
         return
     if keys[b'w']:
-        player_jet.accelerate()
+        player_jet.accelerate(dt)
     if keys[b's']:
-        player_jet.brake()
+        player_jet.brake(dt)
     if keys[b'a']:
-        player_jet.steer_left()
+        player_jet.steer_left(dt)
     if keys[b'd']:
-        player_jet.steer_right()
+        player_jet.steer_right(dt)
     if not keys[b'a'] and not keys[b'd']:
-        player_jet.center_rotation()
+        player_jet.center_rotation(dt)
 
 # --- NEW: AUTO PILOT LOGIC ---
-def run_auto_pilot():
-    """Overrides manual controls to steer automatically"""
+def run_auto_pilot(dt):
+    """Overrides manual controls: flies the planned lane path (see autopilot.LanePlanner)"""
     if player_jet.crashed:
         return
 
-    # Always accelerate in auto-pilot
-    player_jet.accelerate()
-    
-    # 1. Look ahead for obstacles
-    scan_distance = 500  # How far ahead to look
-    safe_width = 100     # Width of the jet's path to check
-    nearest_threat = None
-    min_dist = 1000
-
-    for obs in obstacles:
-        if obs[1] < -100: continue # Skip old obstacles
-        
-        dy = obs[1] - player_jet.y
-        dx = obs[0] - player_jet.x
-        
-        # Check if obstacle is ahead and within danger width
-        if 0 < dy < scan_distance:
-            if abs(dx) < safe_width: 
-                if dy < min_dist:
-                    min_dist = dy
-                    nearest_threat = obs
-
-    # 2. React to threats
-    if nearest_threat:
-        # If obstacle is to our right, steer left. If left, steer right.
-        if nearest_threat[0] > player_jet.x:
-             player_jet.steer_left()
-        else:
-             player_jet.steer_right()
+    shield = None
+    if shield_token and shield_token[3] and not player_jet.has_shield:
+        shield = (shield_token[0], shield_token[1])
+    target = autopilot.target_x(player_jet.x, player_jet.y, player_jet.velocity_y, world_version,
+                                obstacles, coin_positions, shield, autopilot_jets)
+
+    # Hold back while every path ahead is blocked (usually slower jets); otherwise full
+    # throttle. With a jet closing in from behind, don't brake, and don't sit still.
+    if not autopilot.blocked:
+        player_jet.accelerate(dt)
+    elif autopilot.rear_threat:
+        if player_jet.velocity_y < 4:
+            player_jet.accelerate(dt)
+    elif player_jet.velocity_y > 4:
+        player_jet.brake(dt)
+
+    # Steer for the target lane, allowing for the sideways drift we already have
+    error = target - (player_jet.x + player_jet.velocity_x * 6)
+    if error > 10:
+        player_jet.steer_right(dt)
+    elif error < -10:
+        player_jet.steer_left(dt)
     else:
-        # 3. Lane Centering / Stabilization (if no threat)
-        # Avoid hitting the side walls
-        if player_jet.x > ROAD_WIDTH/2 - 100:
-            player_jet.steer_left()
-        elif player_jet.x < -ROAD_WIDTH/2 + 100:
-            player_jet.steer_right()
-        else:
-            player_jet.center_rotation()
+        player_jet.center_rotation(dt)
+
+def autopilot_jets():
+    """(x, y, vy) of the live jets that could be in the planner's way: from just
+    behind the player up to as far ahead as the plan reaches"""
+    y_min, y_max = player_jet.y - 200, player_jet.y + autopilot.reach
+    # Finished jets stay parked past the line (and still collide)
+    jets = [(jet.x, jet.y, 0.0 if jet.finished else jet.velocity_y) for jet in ai_jets
+            if not jet.crashed and y_min < jet.y < y_max]
+    if fleet is not None:
+        xs, ys, vys, crashed, finished = fleet.x, fleet.y, fleet.vy, fleet.crashed, fleet.finished
+        jets += [(xs[i], ys[i], 0.0 if finished[i] else vys[i]) for i in range(len(ys))
+                 if y_min < ys[i] < y_max and not crashed[i]]
+    return jets
 # -----------------------------
 
 def mouse_click(button, state, x, y):
+    global queued_shots, trigger_held
+    if button == GLUT_LEFT_BUTTON:
+        trigger_held = state == GLUT_DOWN
     if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
         if game_state == RACING and not player_jet.crashed:
-            fire_bullet()
+            queued_shots += 1 # Fired on the next tick
 
 def initialize_race_cars():
     player_jet.x, player_jet.y, player_jet.z = 0, 0, 30
@@ -805,9 +1325,12 @@ def initialize_race_cars():
     player_jet.bank_angle = 0
     player_jet.finished = False
     player_jet.crashed = False
+    player_jet.crash_cause = None
     player_jet.speed = 0
     
     player_jet.has_shield = False
+    autopilot.reset()
+    particles.clear()
     
     ai_starting_positions = [
         (-180, 150, 30), 
@@ -818,14 +1341,23 @@ def initialize_race_cars():
         if i < len(ai_starting_positions):
             jet.x, jet.y, jet.z = ai_starting_positions[i]
         else:
-            jet.x, jet.y, jet.z = random.uniform(-100, 100), random.uniform(200, 400), 30
+            jet.x, jet.y, jet.z = ai_rng.uniform(-100, 100), ai_rng.uniform(200, 400), 30
         jet.velocity_x = jet.velocity_y = 0
         jet.rotation = 0
         jet.bank_angle = 0
         jet.finished = False
         jet.crashed = False
+        jet.crash_cause = None
         jet.speed = 0
 
+    for jet in all_jets:
+        jet.prev_x, jet.prev_y, jet.prev_z = jet.x, jet.y, jet.z
+
+    global fleet, ai_speed_multiplier, ai_ticks
+    fleet = JetFleet(fleet_size, ROAD_WIDTH) if fleet_size else None
+    ai_speed_multiplier = get_ai_speed_multiplier()
+    ai_ticks = 0
+
 def start_next_level():
     """Helper function to prepare and launch the next level"""
     global game_state, race_start_time, level_cleared, ROAD_LENGTH, FINISH_LINE_POSITION
@@ -839,23 +1371,64 @@ def start_next_level():
     ROAD_LENGTH = 3000 + (current_level * 2000)
     FINISH_LINE_POSITION = ROAD_LENGTH - 200
     
+    release_level_resources()
+    seed_race()
     initialize_race_cars()
     generate_level_objects()
     
     level_cleared = False
     game_state = RACING
-    race_start_time = time.time()
+    race_start_time = game_time()
+
+def seed_race(seed=None):
+    """Start a new race's random streams (a fresh seed unless one is given or --seed is set)"""
+    global race_seed, race_serial, sim_clock, queued_shots, cheat_toggle_queued, race_checkpoint
+    if seed is None and base_seed is not None:
+        seed = (base_seed * 1009 + current_level) % 2**32 # Same track on every restart
+    race_seed = random.randrange(2**32) if seed is None else seed
+    race_serial += 1
+    level_rng.seed(f"{race_seed}:level")
+    ai_rng.seed(f"{race_seed}:ai")
+    fx_rng.seed(f"{race_seed}:fx")
+    sim_clock = 0.0 # Each race replays from the same clock
+    snapshots.clear()
+    race_checkpoint = None
+    queued_shots = 0
+    cheat_toggle_queued = False
+
+def begin_race(seed=None):
+    """Launch a race at the current level (menu SPACE, headless runs)"""
+    global game_state, race_start_time, ROAD_LENGTH, FINISH_LINE_POSITION
+    seed_race(seed)
+    game_state = RACING
+    race_start_time = game_time()
+    ROAD_LENGTH = 3000 + (current_level * 2000)
+    FINISH_LINE_POSITION = ROAD_LENGTH - 200
+    generate_level_objects()
+    initialize_race_cars()
 
 def keyboard_down(key, x, y):
     global game_state, race_start_time, first_person_view, current_level, ROAD_LENGTH, FINISH_LINE_POSITION
-    global cyberpunk_mode, custom_difficulty, level_cleared, cheat_mode
+    global cyberpunk_mode, custom_difficulty, level_cleared, cheat_mode, track_geometry_dirty
+    global show_profiler, minigun_mode
     
+    if key == b'f':
+        show_profiler = not show_profiler
+        profiler.enabled = show_profiler or profile_csv_path is not None
+
+    if key == b'g':
+        minigun_mode = not minigun_mode
+
     if key == b'm':
         cyberpunk_mode = not cyberpunk_mode
+        track_geometry_dirty = True # Scenery colors are baked into display lists
+        gl_resources.release(THEME) # So are the jets'
+        jet_meshes.clear()
 
     # --- NEW: TOGGLE CHEAT MODE ---
     if key == b'c' and game_state == RACING:
-        cheat_mode = not cheat_mode
+        global cheat_toggle_queued
+        cheat_toggle_queued = True # Applied on the next tick
     # ------------------------------
         
     if game_state == GAME_COMPLETE:
@@ -868,23 +1441,13 @@ def keyboard_down(key, x, y):
         elif key == b'w': custom_difficulty = 2
         elif key == b'e': custom_difficulty = 3
         elif key == b' ':
-            game_state = RACING
-            race_start_time = time.time()
-            ROAD_LENGTH = 3000 + (current_level * 2000)
-            FINISH_LINE_POSITION = ROAD_LENGTH - 200
-            generate_level_objects()
-            initialize_race_cars()
+            begin_race()
         elif key == b'\x1b':
             game_state = MENU
             
     elif key == b' ':
         if game_state == MENU:
-            game_state = RACING
-            race_start_time = time.time()
-            ROAD_LENGTH = 3000 + (current_level * 2000)
-            FINISH_LINE_POSITION = ROAD_LENGTH - 200
-            generate_level_objects()
-            initialize_race_cars()
+            begin_race()
         # --- NEW: Press Space to Continue to Next Level ---
         elif game_state == FINISHED and level_cleared:
             start_next_level()
@@ -902,6 +1465,10 @@ def keyboard_down(key, x, y):
     
     elif key == b'r':
         restart_highway_race()
+    elif key == b'z' and game_state in (RACING, PAUSED, FINISHED):
+        rewind_race(REWIND_SECONDS)
+    elif key == b'x' and game_state in (RACING, PAUSED, FINISHED):
+        retry_race()
     elif key == b'\x1b':
         if game_state == CUSTOM_RACE_MENU:
             game_state = MENU
@@ -948,10 +1515,12 @@ def restart_highway_race():
     ROAD_LENGTH = 3000 + (current_level * 2000)
     FINISH_LINE_POSITION = ROAD_LENGTH - 200
     
+    release_level_resources()
+    seed_race()
     initialize_race_cars()
     generate_level_objects()
     game_state = RACING
-    race_start_time = time.time()
+    race_start_time = game_time()
 
 def reset_to_new_game():
     global current_level, races_won, coins_collected, game_state, level_cleared, cheat_mode
@@ -965,59 +1534,105 @@ def reset_to_new_game():
     FINISH_LINE_POSITION = ROAD_LENGTH - 200
     game_state = MENU
 
+def collide_jets():
+    """Jet vs jet crashes for every live jet (sweep-and-prune along y).
+    Returns True when the player went down."""
+    global game_state
+    racers = [jet for jet in all_jets if not jet.crashed]
+    xs = [jet.x for jet in racers]
+    ys = [jet.y for jet in racers]
+    slots = []
+    if fleet is not None:
+        slots = fleet.live_indices()
+        xs += [fleet.x[i] for i in slots]
+        ys += [fleet.y[i] for i in slots]
+    named = len(racers)
+
+    def is_crashed(k):
+        return racers[k].crashed if k < named else fleet.crashed[slots[k - named]]
+
+    def crash(k):
+        world_changed()
+        if k < named:
+            racers[k].crashed = True
+            racers[k].crash_cause = "jet"
+            jet = racers[k]
+            explode(jet.x, jet.y, jet.z, jet.velocity_x, jet.velocity_y)
+        else:
+            s = slots[k - named]
+            fleet.crashed[s] = 1
+            explode(fleet.x[s], fleet.y[s], fleet.z[s], fleet.vx[s], fleet.vy[s])
+
+    for a, b in overlapping_pairs(xs, ys, JET_COLLISION_RADIUS):
+        if is_crashed(a) or is_crashed(b):
+            continue
+        # Player is always first in all_jets, so only ever slot 0
+        if a == 0 and racers[0].is_player:
+            # SHIELD LOGIC: If player has shield, destroy enemy, consume shield, keep player alive
+            if player_jet.has_shield:
+                player_jet.has_shield = False
+                crash(b)
+            else:
+                player_jet.crashed = True
+                player_jet.crash_cause = "jet"
+                explode(player_jet.x, player_jet.y, player_jet.z, player_jet.velocity_x, player_jet.velocity_y)
+                crash(b)
+                game_state = FINISHED
+                return True
+        else:
+            # AI vs AI - both crash
+            crash(a)
+            crash(b)
+    return False
+
 def update_highway_game(dt):
-    global game_state, level_cleared
+    global game_state, level_cleared, sim_clock, queued_shots, cheat_toggle_queued, cheat_mode
+    global race_checkpoint
     if game_state == RACING:
+        if not endless_mode:
+            if race_checkpoint is None:
+                race_checkpoint = capture_world()
+            if round(sim_clock * SIM_HZ) % SNAPSHOT_INTERVAL == 0:
+                snapshots.push(sim_clock, capture_world())
+        sim_clock += dt
+
+        if minigun_mode and trigger_held and not player_jet.crashed:
+            queued_shots += 1 # Held fire: a round every tick
+
+        # Inputs queued since the last tick (recorded so replays match). At most
+        # MAX_SHOTS_PER_TICK go out per tick, which is all a recording can hold;
+        # the rest wait for the next ticks.
+        shots = min(queued_shots, MAX_SHOTS_PER_TICK)
+        queued_shots -= shots
+        if input_recorder is not None:
+            input_recorder.record(encode_inputs(keys, shots, cheat_toggle_queued))
+        if cheat_toggle_queued:
+            cheat_mode = not cheat_mode
+            cheat_toggle_queued = False
+        if not player_jet.crashed:
+            for _ in range(shots):
+                fire_bullet()
+
         # --- MODIFIED CONTROL LOGIC ---
         if cheat_mode:
-            run_auto_pilot()
+            run_auto_pilot(dt)
         else:
             handle_highway_controls(dt)
         # ------------------------------
         
-        # Check Jet Collision
-        for i, jet1 in enumerate(all_jets):
-            if jet1.crashed:
-                continue
-            for j, jet2 in enumerate(all_jets):
-                if i >= j or jet2.crashed:
-                    continue
-                if detect_car_collision(jet1, jet2):
-                    # Identify if Player is involved
-                    player_involved = None
-                    enemy_involved = None
-                    
-                    if jet1.is_player:
-                        player_involved = jet1
-                        enemy_involved = jet2
-                    elif jet2.is_player:
-                        player_involved = jet2
-                        enemy_involved = jet1
-                    
-                    if player_involved:
-                        # SHIELD LOGIC: If player has shield, destroy enemy, consume shield, keep player alive
-                        if player_involved.has_shield:
-                            player_involved.has_shield = False
-                            enemy_involved.crashed = True
-                        else:
-                            player_involved.crashed = True
-                            enemy_involved.crashed = True
-                            game_state = FINISHED
-                            return
-                    else:
-                        # AI vs AI - both crash
-                        jet1.crashed = True
-                        jet2.crashed = True
+        if collide_jets():
+            return
 
         player_jet.update(dt)
         update_bullets(dt) # Move bullets
         update_ai_racers(dt)
+        # Safe point: no indices held, drop dead coins/obstacles
+        if endless_mode:
+            stream_track()
+        coin_positions.compact()
+        obstacles.compact()
         if player_jet.finished:
-            player_won = True
-            for jet in ai_jets:
-                if jet.finished and not jet.crashed and jet.race_time < player_jet.race_time:
-                    player_won = False
-                    break
+            player_won = player_beat_field()
             if player_won:
                 # --- CHANGE: Do not level up immediately ---
                 # level_up() 
@@ -1025,6 +1640,17 @@ def update_highway_game(dt):
                 # -------------------------------------------
             game_state = FINISHED
 
+def player_beat_field():
+    """True unless an intact AI jet finished ahead of the player"""
+    for jet in ai_jets:
+        if jet.finished and not jet.crashed and jet.race_time < player_jet.race_time:
+            return False
+    if fleet is not None:
+        best = fleet.best_finish_time()
+        if best is not None and best < player_jet.race_time:
+            return False
+    return True
+
 def display():
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     if game_state == MENU:
@@ -1039,30 +1665,47 @@ def display():
         else:
             glClearColor(0.0, 0.0, 0.0, 1) 
             
+        started = profiler.start()
         update_highway_camera()
+        view_culler.begin_frame()
+        lod.begin_frame(view_culler.eye_x, view_culler.eye_y)
+        profiler.stop("camera", started)
         glEnable(GL_DEPTH_TEST)
-        draw_highway_environment()
+        started = profiler.start()
+        draw_track_scenery()
+        profiler.stop("scenery", started)
+        started = profiler.start()
         draw_highway_road()
-        if first_person_view:
-            for jet in ai_jets:
-                draw_fighter_jet(jet)
-        else:
-            for jet in all_jets:
+        profiler.stop("road", started)
+        started = profiler.start()
+        for jet in ai_jets:
+            if view_culler.visible(jet.x, jet.y, jet.z, 30):
                 draw_fighter_jet(jet)
+        if not first_person_view:
+            draw_fighter_jet(player_jet)
+        draw_fleet()
+        draw_impostors()
+        profiler.stop("jets", started)
+        started = profiler.start()
+        draw_particles()
+        profiler.stop("fx", started)
         glDisable(GL_DEPTH_TEST)
+        started = profiler.start()
+        begin_text_batch()
         draw_dashboard_hud()
         if game_state == PAUSED:
-            draw_text_2d(WINDOW_WIDTH//2 - 50, WINDOW_HEIGHT//2, "PAUSED")
+            draw_text_2d(WINDOW_WIDTH//2 - 50, WINDOW_HEIGHT//2, "PAUSED", cached=True)
+        if show_profiler:
+            draw_profiler_overlay()
+        end_text_batch()
+        profiler.stop("hud", started)
     elif game_state == FINISHED:
+        begin_text_batch()
         if player_jet.crashed:
             draw_text_2d(WINDOW_WIDTH//2 - 80, WINDOW_HEIGHT//2 + 60, "MAYDAY! CRASHED!")
             draw_text_2d(WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 + 30, "Mid-air collision detected!")
         else:
-            player_won = True
-            for jet in ai_jets:
-                if jet.finished and not jet.crashed and jet.race_time < player_jet.race_time:
-                    player_won = False
-                    break
+            player_won = player_beat_field()
             if player_won:
                 # --- NEW DISPLAY LOGIC FOR LEVEL CLEARED ---
                 if current_level >= max_level and level_cleared:
@@ -1085,22 +1728,140 @@ def display():
         if not level_cleared:
             draw_text_2d(WINDOW_WIDTH//2 - 80, WINDOW_HEIGHT//2 - 100, "Press R to Restart Campaign")
             draw_text_2d(WINDOW_WIDTH//2 - 80, WINDOW_HEIGHT//2 - 130, "Press ESC for Base")
+            if race_checkpoint is not None:
+                draw_text_2d(WINDOW_WIDTH//2 - 80, WINDOW_HEIGHT//2 - 160, "Z: Rewind 3s | X: Retry Level")
+        end_text_batch()
             
     glutSwapBuffers()
+    profiler.end_frame(game_time() - race_start_time)
+    gl_resources.end_frame()
+    if startup_report is not None:
+        print_startup_report()
+    if bench_frames:
+        count_bench_frame()
+
+def count_bench_frame():
+    """--bench-frames: after the last frame print the profiler numbers as JSON and quit"""
+    global bench_frames
+    bench_frames -= 1
+    if bench_frames:
+        return
+    frame_p50, frame_p99 = profiler.percentiles(profiler.frame_ring)
+    print(json.dumps({
+        "frames": profiler.count,
+        "fps": round(profiler.fps(), 1),
+        "frame_ms": [round(frame_p50 * 1000, 3), round(frame_p99 * 1000, 3)],
+        "phases_ms": {phase: [round(p50, 3), round(p99, 3)] for phase, p50, p99 in profiler.summary()},
+    }), flush=True)
+    try:
+        glutLeaveMainLoop()
+    except:
+        pass
+    os._exit(0)
+
+def print_startup_report():
+    """Called after the first frame: where the time between main() and the menu went"""
+    global startup_report
+    total = time.perf_counter() - startup_started
+    startup_report.append(("first frame", total - sum(seconds for _, seconds in startup_report)))
+    print("Startup (main() to first frame):")
+    for step, seconds in startup_report:
+        print(f"  {step:<36} {seconds * 1000:8.1f} ms" if seconds else f"  {step}")
+    print(f"  {'total':<36} {total * 1000:8.1f} ms")
+    startup_report = None
+
+def update_race_recording():
+    """Keep one InputRecorder per race; the latest finished race is saved to record_path"""
+    global input_recorder
+    racing = game_state in (RACING, PAUSED)
+    if input_recorder is not None and (not racing or input_recorder.race_serial != race_serial):
+        input_recorder.save(record_path)
+        print(f"Race recorded to {record_path} ({input_recorder.ticks} ticks)")
+        input_recorder = None
+    if racing and input_recorder is None:
+        input_recorder = InputRecorder(race_seed, current_level, custom_difficulty, fleet_size,
+                                       SIM_HZ, cheat_mode, race_serial, endless_mode)
 
 def idle():
-    global last_time, game_complete_time
+    global last_time, game_complete_time, sim_accumulator, render_alpha, cheat_mode
     current_time = time.time()
-    dt = min(current_time - last_time, 0.1)
+    if game_state == RACING:
+        # Stopped otherwise: render_alpha keeps the last pose instead of cycling over a frozen tick
+        sim_accumulator += current_time - last_time
     last_time = current_time
+    if bench_frames:
+        # One tick per frame and the same race on repeat: every run draws the same scenes
+        sim_accumulator = SIM_DT
+        if game_state != RACING:
+            begin_race(bench_seed)
+            cheat_mode = True
     if game_state == GAME_COMPLETE and game_complete_time is not None:
         if (current_time - game_complete_time) >= AUTO_RESTART_SECONDS:
             reset_to_new_game()
-    update_highway_game(dt)
+
+    if record_path:
+        update_race_recording()
+
+    # Fixed SIM_DT steps; a slow frame catches up at most MAX_STEPS_PER_FRAME
+    started = profiler.start()
+    steps = 0
+    while sim_accumulator >= SIM_DT and steps < MAX_STEPS_PER_FRAME:
+        update_highway_game(SIM_DT)
+        sim_accumulator -= SIM_DT
+        steps += 1
+    if steps == MAX_STEPS_PER_FRAME:
+        sim_accumulator = min(sim_accumulator, SIM_DT)
+    render_alpha = sim_accumulator / SIM_DT
+    profiler.stop("sim", started)
+
+    # One CSV per race: start when racing begins, write it out when the race ends
+    if profile_csv_path:
+        racing = game_state in (RACING, PAUSED)
+        if racing and not profiler.recording:
+            profiler.start_recording()
+        elif not racing and profiler.recording:
+            profiler.dump_csv(profile_csv_path)
+            print(f"Frame profile written to {profile_csv_path}")
     glutPostRedisplay()
 
 def main():
-    generate_level_objects()
+    global fleet_size, profile_csv_path, record_path, endless_mode, base_seed, level_cache
+    global startup_report, startup_started, bench_frames, bench_seed
+    parser = argparse.ArgumentParser(description="Jet Racer 3D")
+    parser.add_argument("--fleet", type=int, default=0, help="extra AI jets (fleet mode)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="write per-frame phase timings of each race")
+    parser.add_argument("--record", metavar="PATH", help="save the inputs of the latest race (see replay.py)")
+    parser.add_argument("--endless", action="store_true", help="no finish line; race until you crash")
+    parser.add_argument("--seed", type=int, help="fixed track per level, so restarts replay the same layout")
+    parser.add_argument("--level-cache", metavar="DIR",
+                        help="keep generated layouts on disk and reuse them (without --seed, one seed per session)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print import / window / first-frame times (module imports: python -X importtime)")
+    parser.add_argument("--gl-mode", choices=["fast", "standard", "debug"], default="standard",
+                        help="fast: no PyOpenGL error checks or logging; debug: log every GL error")
+    parser.add_argument("--bench-frames", type=int, default=0, metavar="N",
+                        help="autopilot a fixed race for N frames, print frame timings as JSON, exit")
+    args = parser.parse_args()
+    base_seed = args.seed
+    if args.level_cache:
+        level_cache = LevelCache(args.level_cache)
+        if base_seed is None:
+            base_seed = random.randrange(2**32) # Restarts replay the track, so they hit the cache
+    fleet_size = args.fleet
+    endless_mode = args.endless
+    record_path = args.record
+    profile_csv_path = args.profile_csv
+    profiler.enabled = profile_csv_path is not None
+    if args.bench_frames:
+        bench_frames = args.bench_frames
+        if args.seed is not None:
+            bench_seed = args.seed
+        profiler.enabled = True
+
+    # The track is generated when a race starts; the menu only needs GL
+    startup_started = time.perf_counter()
+    timings = load_gl(mode=args.gl_mode)
+    started = time.perf_counter()
     glutInit()
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
     glutInitWindowSize(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -1110,6 +1871,8 @@ def main():
     glEnable(GL_LIGHT0)
     glLightfv(GL_LIGHT0, GL_POSITION, [100, 100, 200, 1])
     glEnable(GL_COLOR_MATERIAL)
+    if args.startup_report:
+        startup_report = timings + [("GLUT init + window", time.perf_counter() - started)]
     glutDisplayFunc(display)
     glutKeyboardFunc(keyboard_down)
     glutMouseFunc(mouse_click) # Register Mouse Function
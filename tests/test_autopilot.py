@@ -0,0 +1,27 @@
+"""Autopilot in a crowded field, run through the headless runner"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+import test as game
+
+
+def test_launches_clear_of_the_fleet():
+    for seed in range(1, 6):
+        headless.start_race(level=3, seed=seed, fleet=10)
+        for _ in range(2 * game.SIM_HZ):
+            headless.tick()
+        assert not game.player_jet.crashed, (seed, game.player_jet.crash_cause)
+        assert game.player_jet.y > 100  # Got going instead of holding on the line
+
+
+def test_planner_only_gets_jets_in_its_window():
+    headless.start_race(level=3, seed=1, fleet=300)
+    player_y = game.player_jet.y
+    game.fleet.y[0] = player_y + game.autopilot.reach + 1  # Beyond the last row it plans
+    game.fleet.y[1] = player_y + 100
+    ys = [y for _, y, _ in game.autopilot_jets()]
+    assert player_y + 100 in ys and game.fleet.y[0] not in ys
+    assert all(player_y - 200 < y < player_y + game.autopilot.reach for y in ys)
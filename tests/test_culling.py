@@ -0,0 +1,93 @@
+"""View culling against points projected the way gluPerspective / gluLookAt do"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from culling import ViewCuller
+
+ASPECT = 1200 / 800
+NEAR, FAR = 1, 5000
+
+
+def on_screen(point, eye, look, fov_y):
+    """Clip-space test of one point, from the GLU matrices"""
+    f = [l - e for l, e in zip(look, eye)]
+    norm = math.sqrt(sum(c * c for c in f))
+    f = [c / norm for c in f]
+    s = [f[1], -f[0], 0.0]  # f x (0, 0, 1)
+    norm = math.hypot(s[0], s[1])
+    s = [c / norm for c in s]
+    u = [s[1] * f[2] - s[2] * f[1], s[2] * f[0] - s[0] * f[2], s[0] * f[1] - s[1] * f[0]]
+    d = [p - e for p, e in zip(point, eye)]
+    x, y, z = (sum(a * b for a, b in zip(row, d)) for row in (s, u, [-c for c in f]))
+    cot = 1 / math.tan(math.radians(fov_y) / 2)
+    w = -z
+    clip_x, clip_y = cot / ASPECT * x, cot * y
+    clip_z = (FAR + NEAR) / (NEAR - FAR) * z + 2 * FAR * NEAR / (NEAR - FAR)
+    return w > 0 and abs(clip_x) <= w and abs(clip_y) <= w and abs(clip_z) <= w
+
+
+def sphere_on_screen(center, radius, eye, look, fov_y, steps=24):
+    """Any sampled point of the sphere (surface and center) on screen"""
+    points = [center]
+    for i in range(steps + 1):
+        theta = math.pi * i / steps
+        for j in range(2 * steps):
+            phi = math.pi * j / steps
+            points.append((center[0] + radius * math.sin(theta) * math.cos(phi),
+                           center[1] + radius * math.sin(theta) * math.sin(phi),
+                           center[2] + radius * math.cos(theta)))
+    return any(on_screen(p, eye, look, fov_y) for p in points)
+
+
+def chase_camera(jet):
+    """Camera arguments as update_highway_camera sets them up behind the jet"""
+    x, y, z = jet
+    return (x * 0.8, y - 250, z + 120), (x, y + 100, z), 60
+
+
+def test_small_object_in_bottom_corner_is_drawn():
+    eye, look, fov_y = chase_camera((0.0, 0.0, 30.0))
+    culler = ViewCuller(FAR, ASPECT)
+    culler.set_camera(*eye, *look, fov_y)
+    # Find the ground-level coin position nearest the bottom-left corner that is on screen
+    corner = None
+    for y in range(-250, 400, 5):
+        for x in range(-400, 0, 5):
+            if on_screen((x, y, 30.0), eye, look, fov_y):
+                corner = (x, y, 30.0)
+                break
+        if corner:
+            break
+    assert corner is not None
+    assert culler.visible(*corner, 10)
+
+
+def test_never_culls_a_sphere_that_is_on_screen():
+    for jet, cockpit in (((0.0, 0.0, 30.0), False), ((150.0, 2000.0, 31.0), False),
+                         ((-200.0, 500.0, 29.0), True)):
+        if cockpit:
+            eye, look, fov_y = (jet[0], jet[1] + 10, jet[2] + 5), (jet[0], jet[1] + 100, jet[2]), 70
+        else:
+            eye, look, fov_y = chase_camera(jet)
+        culler = ViewCuller(FAR, ASPECT)
+        culler.set_camera(*eye, *look, fov_y)
+        for dy in range(-300, 1200, 53):
+            for dx in range(-700, 700, 59):
+                for radius in (10, 60):
+                    center = (jet[0] + dx, jet[1] + dy, 30.0)
+                    if sphere_on_screen(center, radius, eye, look, fov_y, steps=8):
+                        assert culler.visible(*center, radius), (center, radius, cockpit)
+
+
+def test_culls_what_is_well_outside():
+    eye, look, fov_y = chase_camera((0.0, 0.0, 30.0))
+    culler = ViewCuller(FAR, ASPECT)
+    culler.set_camera(*eye, *look, fov_y)
+    assert culler.visible(0.0, 1000.0, 30.0, 10)
+    assert not culler.visible(0.0, -400.0, 30.0, 10)  # Behind the camera
+    assert not culler.visible(2000.0, 300.0, 30.0, 10)  # Far off to the side
+    assert not culler.visible(0.0, 6000.0, 30.0, 10)  # Past the far plane
+    assert (culler.drawn, culler.culled) == (1, 3)
@@ -0,0 +1,38 @@
+"""AI jets far from the player: batched decisions must not outrun the per-tick ones"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet import NEAR_RANGE, JetFleet
+
+import headless
+import test as game
+
+SPEED_MULTIPLIER = 5.0  # Thrust big enough that a whole batch of it would overshoot
+AIR_RESISTANCE = 0.99
+
+
+def test_fleet_far_jets_hold_max_speed():
+    fleet = JetFleet(12, road_width=800)
+    tick_thrust = fleet.acceleration_power * SPEED_MULTIPLIER
+    top = 0.0
+    for n in range(1200):
+        fleet.update(game.SIM_DT, n * game.SIM_DT, 0.0, -10 * NEAR_RANGE, SPEED_MULTIPLIER,
+                     AIR_RESISTANCE, 1e9, 0.0)
+        top = max(top, max(fleet.speed))
+    assert fleet.max_speed - 1 < top <= fleet.max_speed + tick_thrust
+
+
+def test_named_far_jets_hold_max_speed():
+    headless.start_race(level=1, seed=3, autopilot=False)
+    game.keys[b'w'] = False
+    game.ai_speed_multiplier = SPEED_MULTIPLIER
+    game.player_jet.y = -10 * NEAR_RANGE
+    tick_thrust = game.ai_jets[0].acceleration_power * SPEED_MULTIPLIER
+    top = 0.0
+    for _ in range(600):
+        headless.tick()
+        top = max(top, max(jet.speed for jet in game.ai_jets if not jet.finished))
+    assert all(abs(jet.y - game.player_jet.y) >= NEAR_RANGE for jet in game.ai_jets)
+    assert 9.5 - 1 < top <= 9.5 + tick_thrust
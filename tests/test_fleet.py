@@ -0,0 +1,26 @@
+"""Fleet mode start: the grid behind the player"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet import JetFleet
+
+import headless
+import test as game
+
+
+def test_grid_leaves_the_players_lane_clear():
+    for road_width in (800, game.ROAD_WIDTH):
+        fleet = JetFleet(40, road_width)
+        assert min(abs(x) for x in fleet.x) > game.JET_COLLISION_RADIUS
+        assert max(fleet.y) < 0
+
+
+def test_idle_player_survives_the_launch():
+    for fleet_size in (10, 300):
+        headless.start_race(level=3, seed=1, fleet=fleet_size, autopilot=False)
+        game.keys[b'w'] = False  # No input at all
+        for _ in range(game.SIM_HZ):
+            headless.tick()
+        assert not game.player_jet.crashed, fleet_size
@@ -0,0 +1,52 @@
+"""Level layouts cached on disk: corrupt files, mapping lifetime, eviction"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from level_cache import HEADER_SIZE, LevelCache
+from world import ItemStore
+
+ROAD_LENGTH = 5000
+
+
+def layout():
+    coins = ItemStore([1.0, 2.0], [200.0, 400.0], [30, 30], [0, 0])
+    obstacles = ItemStore([-5.0], [900.0], [30], [1])
+    return coins, obstacles, [3.0, 1500.0, 30, True]
+
+
+def test_round_trip_and_close(tmp_path):
+    cache = LevelCache(str(tmp_path))
+    cache.store(1, 7, ROAD_LENGTH, *layout())
+    coins, obstacles, shield = cache.load(1, 7, ROAD_LENGTH)
+    assert list(coins.y) == [200.0, 400.0] and list(obstacles.kind) == [1]
+    assert shield == [3.0, 1500.0, 30.0, True]
+    mapped = cache.mapped
+    assert cache.load(2, 7, ROAD_LENGTH) is None  # Loading the next level unmaps this one
+    assert mapped.closed
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_truncated_or_corrupt_file_is_a_miss(tmp_path):
+    cache = LevelCache(str(tmp_path))
+    path = cache.path(1, 7)
+    for size in (2, HEADER_SIZE + 8):  # Cut inside the header, then inside the columns
+        cache.store(1, 7, ROAD_LENGTH, *layout())
+        with open(path, "r+b") as f:
+            f.truncate(size)
+        assert cache.load(1, 7, ROAD_LENGTH) is None
+    with open(path, "wb") as f:
+        f.write(b"garbage" * 20)
+    assert cache.load(1, 7, ROAD_LENGTH) is None
+    assert cache.misses == 3 and cache.mapped is None
+    cache.store(1, 7, ROAD_LENGTH, *layout())  # Regenerated and rewritten
+    assert cache.load(1, 7, ROAD_LENGTH) is not None
+
+
+def test_oldest_files_are_evicted(tmp_path):
+    cache = LevelCache(str(tmp_path), max_files=3)
+    for seed in range(5):
+        cache.store(1, seed, ROAD_LENGTH, *layout())
+        os.utime(cache.path(1, seed), (seed, seed))
+    assert sorted(os.listdir(tmp_path)) == ["level1-2.jlc", "level1-3.jlc", "level1-4.jlc"]
@@ -0,0 +1,45 @@
+"""Exhaust plumes placed on the CPU match the matrix draw_fighter_jet used to set up"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from particles import MAX_PLUMES, PLUME_SIZE, ParticlePool
+
+
+def matmul(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+
+
+def translate(x, y, z):
+    return [[1, 0, 0, x], [0, 1, 0, y], [0, 0, 1, z], [0, 0, 0, 1]]
+
+
+def rotate(degrees, axis):
+    """glRotatef about the z (axis 2) or y (axis 1) axis"""
+    c, s = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+    if axis == 2:
+        return [[c, -s, 0, 0], [s, c, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+    return [[c, 0, s, 0], [0, 1, 0, 0], [-s, 0, c, 0], [0, 0, 0, 1]]
+
+
+def test_plumes_match_the_gl_matrix():
+    pool = ParticlePool(seed=3)
+    nozzles = [(10.0, 500.0, 30.0, 0.0, 0.0, 1.0), (-120.0, 2000.0, 31.5, 17.0, -40.0, 1.2),
+               (300.0, -50.0, 28.0, -25.0, 90.0, 0.8)]
+    assert pool.place_plumes(nozzles) == 3 * PLUME_SIZE
+    for n, (x, y, z, rotation, bank, pulse) in enumerate(nozzles):
+        matrix = translate(x, y, z)
+        for step in (rotate(rotation, 2), rotate(bank, 1), translate(0, -21, 0),
+                     [[1, 0, 0, 0], [0, pulse, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]):
+            matrix = matmul(matrix, step)
+        for i, point in enumerate(pool.plume_points):
+            expected = [sum(row[k] * c for k, c in enumerate(point + (1,))) for row in matrix[:3]]
+            k = 3 * (n * PLUME_SIZE + i)
+            assert all(abs(a - b) < 1e-3 for a, b in zip(pool.plume_vertices[k:k + 3], expected))
+
+
+def test_plumes_past_capacity_are_dropped():
+    pool = ParticlePool()
+    assert pool.place_plumes([(0.0, 0.0, 30.0, 0.0, 0.0, 1.0)] * (MAX_PLUMES + 5)) == MAX_PLUMES * PLUME_SIZE
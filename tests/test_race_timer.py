@@ -0,0 +1,30 @@
+"""Race clock as the HUD shows it, driven through the headless runner"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gl_record
+import gl_resources
+import headless
+import test as game
+
+
+def test_race_clock_counts_sim_time():
+    headless.start_race(level=1, seed=7)
+    assert game.game_time() == game.race_start_time  # The clock restarts with the race
+    for _ in range(game.SIM_HZ):
+        headless.tick()
+    assert game.game_state == game.RACING
+    assert abs(game.game_time() - game.race_start_time - 1.0) < 1e-9
+
+
+def test_hud_shows_race_time(monkeypatch):
+    game.load_gl(gl_record.RecordingGL().namespace(game, gl_resources))
+    headless.start_race(level=1, seed=7)
+    for _ in range(game.SIM_HZ // 2):
+        headless.tick()
+    shown = []
+    monkeypatch.setattr(game, "draw_text_2d", lambda x, y, text, *args, **kwargs: shown.append(text))
+    game.draw_dashboard_hud()
+    assert "Time: 0.5s" in shown
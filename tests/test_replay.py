@@ -0,0 +1,32 @@
+"""Recorded inputs replay the same race"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+import replay
+import test as game
+
+
+def test_burst_of_shots_replays_exactly():
+    headless.start_race(level=1, seed=11)
+    first = game.bullets.next_serial  # Serials run on across races
+    game.input_recorder = recording = replay.InputRecorder(
+        game.race_seed, game.current_level, game.custom_difficulty, game.fleet_size,
+        game.SIM_HZ, game.cheat_mode, game.race_serial, game.endless_mode)
+    try:
+        for n in range(60):
+            if n == 10:
+                game.queued_shots += 2 * replay.MAX_SHOTS_PER_TICK + 1  # More than a tick can record
+            headless.tick()
+    finally:
+        game.input_recorder = None
+    fired, position = game.bullets.next_serial - first, (game.player_jet.x, game.player_jet.y)
+    assert fired >= 2 * replay.MAX_SHOTS_PER_TICK + 1 and game.queued_shots == 0
+
+    first = game.bullets.next_serial
+    result = replay.replay(replay.InputRecorder.from_bytes(recording.to_bytes()))
+    assert result["ticks"] == 60
+    assert game.bullets.next_serial - first == fired
+    assert (game.player_jet.x, game.player_jet.y) == position
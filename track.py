@@ -0,0 +1,79 @@
+"""Endless-mode track objects, generated chunk by chunk ahead of the race and evicted behind it"""
+from world import ItemStore
+
+
+class TrackStream:
+    """Coins, obstacles and shields for an unbounded track, using a level's spacing rules.
+
+    Chunks are generated strictly in order from one rng, so the layout only
+    depends on the seed, not on how far ahead advance() is asked to look.
+    """
+
+    def __init__(self, rng, level, road_width, chunk_length=1000):
+        self.rng = rng
+        self.chunk_length = chunk_length
+        self.half_width = road_width / 3
+        # Same density as a normal level: 8 + 4 per level obstacles over
+        # [400, length - 400], one shield per level length
+        self.level_length = 3000 + level * 2000
+        self.obstacle_density = (8 + (level - 1) * 4) / (self.level_length - 800)
+        self.coins = ItemStore()
+        self.obstacles = ItemStore()
+        self.shields = []  # Generated [x, y, z, active] tokens not handed out yet
+        self.generated_to = 0
+        self.evicted_to = 0
+        self.next_coin_y = 200.0
+        self.obstacle_carry = 0.0
+        self.next_shield_y = self.shield_y(0)
+
+    def shield_y(self, segment):
+        start = segment * self.level_length
+        return start + self.rng.uniform(self.level_length * 0.3, self.level_length * 0.8)
+
+    def advance(self, ahead_y, behind_y):
+        """Generate chunks up to ahead_y and evict whole chunks below behind_y"""
+        while self.generated_to < ahead_y:
+            self.generate_chunk()
+        evict_to = max(self.evicted_to, int(behind_y // self.chunk_length) * self.chunk_length)
+        if evict_to > self.evicted_to:
+            self.evicted_to = evict_to
+            self.coins.drop_before(evict_to)
+            self.obstacles.drop_before(evict_to)
+            self.shields = [s for s in self.shields if s[1] >= evict_to]
+
+    def generate_chunk(self):
+        rng = self.rng
+        half = self.half_width
+        y_start = self.generated_to
+        y_end = y_start + self.chunk_length
+
+        # Coins: one every 200-500 units, spacing carried across chunk borders
+        coin_ys = []
+        while self.next_coin_y < y_end:
+            coin_ys.append(self.next_coin_y)
+            self.next_coin_y += rng.uniform(200, 500)
+        self.coins.extend([rng.uniform(-half, half) for _ in coin_ys], coin_ys,
+                          [30] * len(coin_ys), [0] * len(coin_ys))
+
+        # Obstacles: the level's density, the fraction carried to the next chunk
+        span_start = max(y_start, 400)
+        expected = self.obstacle_density * max(0, y_end - span_start) + self.obstacle_carry
+        count = int(expected)
+        self.obstacle_carry = expected - count
+        obs_xs = [rng.uniform(-half, half) for _ in range(count)]
+        obs_ys = [rng.uniform(span_start, y_end) for _ in range(count)]
+        self.obstacles.extend(obs_xs, obs_ys, [30] * count, [rng.choice([0, 1]) for _ in range(count)])
+
+        while self.next_shield_y < y_end:
+            self.shields.append([rng.uniform(-half, half), self.next_shield_y, 30, True])
+            self.next_shield_y = self.shield_y(int(self.next_shield_y // self.level_length) + 1)
+        self.generated_to = y_end
+
+    def next_shield(self, current, passed_y):
+        """The shield token to show: current until it is taken or below passed_y, then the next one"""
+        if self.shields and (current is None or not current[3] or current[1] < passed_y):
+            return self.shields.pop(0)
+        return current
+
+    def nbytes(self):
+        return self.coins.nbytes() + self.obstacles.nbytes()
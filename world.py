@@ -0,0 +1,121 @@
+"""Compact track object storage (coins, obstacles) indexed by track position"""
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+
+class ItemStore:
+    """Struct-of-arrays items kept sorted by y, with an alive mask.
+
+    The y order doubles as the spatial index: a y-window is two bisects, so
+    proximity queries only touch nearby items. kill() just clears the mask;
+    compact() drops dead entries between frames.
+    """
+
+    def __init__(self, xs=(), ys=(), zs=(), kinds=()):
+        order = sorted(range(len(ys)), key=ys.__getitem__)
+        self.x = array('d', [xs[i] for i in order])
+        self.y = array('d', [ys[i] for i in order])
+        self.z = array('d', [zs[i] for i in order])
+        self.kind = array('b', [kinds[i] for i in order])
+        self.alive = bytearray(b'\x01') * len(order)
+        self.dead = 0
+
+    @classmethod
+    def from_columns(cls, x, y, z, kind):
+        """Wrap columns that are already sorted by y, without copying (e.g. mapped from a file)"""
+        store = cls.__new__(cls)
+        store.x, store.y, store.z, store.kind = x, y, z, kind
+        store.alive = bytearray(b'\x01') * len(y)
+        store.dead = 0
+        return store
+
+    def __len__(self):
+        return len(self.y) - self.dead
+
+    def indices(self, y_min=None, y_max=None):
+        """Live indices with y in [y_min, y_max] (whole store if no bounds)"""
+        lo = 0 if y_min is None else bisect_left(self.y, y_min)
+        hi = len(self.y) if y_max is None else bisect_right(self.y, y_max)
+        alive = self.alive
+        return [i for i in range(lo, hi) if alive[i]]
+
+    def within(self, x, y, radius, z=None):
+        """Live indices closer than radius to (x, y[, z]), by squared distance"""
+        xs, ys, zs = self.x, self.y, self.z
+        r_sq = radius * radius
+        hits = []
+        for i in self.indices(y - radius, y + radius):
+            d_sq = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+            if z is not None:
+                d_sq += (zs[i] - z) ** 2
+            if d_sq < r_sq:
+                hits.append(i)
+        return hits
+
+    def extend(self, xs, ys, zs, kinds):
+        """Append items lying at or past the last stored y (keeps the y order)"""
+        order = sorted(range(len(ys)), key=ys.__getitem__)
+        if order and len(self.y) and ys[order[0]] < self.y[-1]:
+            raise ValueError("extend() items must not come before the stored ones")
+        self.x.extend(xs[i] for i in order)
+        self.y.extend(ys[i] for i in order)
+        self.z.extend(zs[i] for i in order)
+        self.kind.extend(kinds[i] for i in order)
+        self.alive.extend(b'\x01' * len(order))
+
+    def drop_before(self, y):
+        """Forget every item with y below the given one. Invalidates indices."""
+        n = bisect_left(self.y, y)
+        if not n:
+            return
+        self.dead -= self.alive[:n].count(0)
+        del self.x[:n], self.y[:n], self.z[:n], self.kind[:n], self.alive[:n]
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = 0
+            self.dead += 1
+
+    def compact(self):
+        """Drop dead entries once they reach 1/8 of the store. Invalidates indices."""
+        if not self.dead or self.dead * 8 < len(self.y):
+            return
+        alive = self.alive
+        self.x = array('d', compress(self.x, alive))
+        self.y = array('d', compress(self.y, alive))
+        self.z = array('d', compress(self.z, alive))
+        self.kind = array('b', compress(self.kind, alive))
+        self.alive = bytearray(b'\x01') * len(self.y)
+        self.dead = 0
+
+    def snapshot(self):
+        """State for restore(). The columns are shared, not copied: compact() replaces
+        them rather than changing them and kill() only touches the mask. Not valid
+        across extend() / drop_before(), which edit the columns in place."""
+        return (self.x, self.y, self.z, self.kind, bytes(self.alive), self.dead)
+
+    def restore(self, snapshot):
+        self.x, self.y, self.z, self.kind, alive, self.dead = snapshot
+        self.alive = bytearray(alive)
+
+    def nbytes(self):
+        arrays = (self.x, self.y, self.z, self.kind)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.alive)
+
+
+def overlapping_pairs(xs, ys, radius):
+    """Sweep-and-prune along y: index pairs (i, j) closer than radius"""
+    order = sorted(range(len(ys)), key=ys.__getitem__)
+    r_sq = radius * radius
+    pairs = []
+    for n, i in enumerate(order):
+        xi, yi = xs[i], ys[i]
+        for m in range(n + 1, len(order)):
+            j = order[m]
+            dy = ys[j] - yi
+            if dy >= radius:
+                break  # Sorted by y: nothing further along can overlap
+            if (xs[j] - xi) ** 2 + dy * dy < r_sq:
+                pairs.append((i, j) if i < j else (j, i))
+    return pairs